@@ -0,0 +1,114 @@
+# Chargement des ressources (sons, images, musique) en arrière-plan.
+# Les fichiers sont lus et décodés par un petit groupe de threads pendant que le menu
+# s'affiche déjà ; en attendant, le jeu utilise des remplaçants (son muet, pas d'image).
+# poll(), appelé une fois par frame, termine les chargements prêts sur le thread
+# principal : conversion des images au format de l'écran, mise en cache, puis appel
+# de la fonction de rappel associée.
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# Nombre de threads de chargement
+WORKERS = 4
+
+# Lecture et décodage, exécutés dans les threads de chargement
+def decode_sound(path, volume):
+    sound = pygame.mixer.Sound(path)
+    sound.set_volume(volume)
+    return sound
+
+def decode_image(path):
+    return pygame.image.load(path)
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+class AssetManager:
+    def __init__(self, workers=WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.pending = []   # [(future, finition, rappel, chemin)]
+        self.sounds = {}    # Chemin -> son décodé
+        self.images = {}    # (chemin, taille, transparence) -> surface convertie
+        self.failed = {}    # Chemin -> erreur de chargement
+        self.started = time.perf_counter()
+        self.load_time = None  # Durée du chargement complet (secondes)
+
+    def submit(self, function, args, finish, callback, path):
+        self.pending.append((self.executor.submit(function, *args), finish, callback, path))
+
+    def load_sound(self, path, volume=1.0, callback=None):
+        # Renvoie un son muet tout de suite ; `callback(son)` reçoit le vrai son une fois prêt
+        if not pygame.mixer.get_init():
+            self.failed[path] = "mixer indisponible"
+            return None
+        self.submit(decode_sound, (path, volume), lambda sound: self.finish_sound(path, sound),
+                    callback, path)
+        return pygame.mixer.Sound(buffer=bytearray(44))
+
+    def load_image(self, path, size=None, alpha=True, callback=None):
+        # L'image est convertie (et redimensionnée) sur le thread principal dans poll()
+        self.submit(decode_image, (path,), lambda image: self.finish_image(path, image, size, alpha),
+                    callback, path)
+
+    def load_music(self, path, callback=None):
+        # La musique est lue en mémoire ici, puis donnée à pygame.mixer.music dans poll()
+        self.submit(read_file, (path,), self.finish_music, callback, path)
+
+    def finish_sound(self, path, sound):
+        self.sounds[path] = sound
+        return sound
+
+    def finish_image(self, path, image, size, alpha):
+        surface = image.convert_alpha() if alpha else image.convert()
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        self.images[path, size, alpha] = surface
+        return surface
+
+    def finish_music(self, data):
+        pygame.mixer.music.load(io.BytesIO(data))
+        return data
+
+    def image(self, path, size=None, alpha=True):
+        # Surface convertie si elle est prête, sinon None
+        return self.images.get((path, size, alpha))
+
+    @property
+    def loading(self):
+        return bool(self.pending)
+
+    def poll(self):
+        # Termine les chargements prêts ; renvoie les erreurs [(chemin, erreur)] de ce passage
+        if not self.pending:
+            return []
+        errors = []
+        still_pending = []
+        for entry in self.pending:
+            future, finish, callback, path = entry
+            if not future.done():
+                still_pending.append(entry)
+                continue
+            try:
+                result = finish(future.result())
+            except Exception as e:
+                self.failed[path] = e
+                errors.append((path, e))
+                continue
+            if callback is not None:
+                callback(result)
+        self.pending = still_pending
+        if not self.pending:
+            self.load_time = time.perf_counter() - self.started
+        return errors
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def wait(self):
+        # Attend la fin de tous les chargements (outils sans affichage)
+        for future, *_ in self.pending:
+            future.exception()
+        return self.poll()
@@ -0,0 +1,96 @@
+# Répartiteur des sons du jeu : les événements sonores de la simulation sont mis en
+# file pendant les ticks, puis joués une seule fois par frame sur un ensemble fixe de
+# canaux réservés. Un même son n'est joué qu'une fois par tick (dix pièces ramassées
+# ensemble ne donnent qu'un son) et son nombre de voix simultanées est plafonné.
+import pygame
+
+# Nombre de canaux réservés aux effets sonores
+CHANNELS = 8
+
+# Nombre maximal de voix simultanées par son
+VOICE_LIMITS = {
+    "jump": 2,
+    "coin": 3,
+    "fireball": 3,
+    "game_over": 1,
+    "victory": 1,
+}
+
+class AudioDispatcher:
+    def __init__(self, sounds, channels=CHANNELS, voice_limits=VOICE_LIMITS):
+        self.sounds = sounds              # Nom de l'événement -> pygame.mixer.Sound
+        self.voice_limits = voice_limits
+        self.pending = []                 # Sons en attente, dans l'ordre des ticks
+        self.voices = {name: [] for name in sounds}  # Nom -> indices des canaux qui jouent ce son
+        self.played = 0
+        self.skipped = 0                  # Sons ignorés (doublons dans un tick ou une frame)
+        self.channels = []
+        if pygame.mixer.get_init():
+            # Les premiers canaux sont réservés : Sound.play() ailleurs ne les prend pas
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+            pygame.mixer.set_reserved(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.started = [0] * len(self.channels)  # Numéro d'ordre du dernier son de chaque canal
+        self.counter = 0
+
+    def post(self, events):
+        # Sons d'un tick : un même son n'est gardé qu'une fois
+        seen = set()
+        for name in events:
+            if name in seen or name not in self.sounds:
+                self.skipped += 1
+                continue
+            seen.add(name)
+            self.pending.append(name)
+
+    def set_sound(self, name, sound):
+        # Ajout ou remplacement d'un son (remplaçant muet puis son chargé)
+        self.sounds[name] = sound
+        self.voices.setdefault(name, [])
+
+    def play(self, name):
+        # Son hors simulation (test du son) : joué à la prochaine frame
+        self.post((name,))
+
+    def clear(self):
+        self.pending.clear()
+
+    def flush(self):
+        # Lecture des sons en attente, une fois par frame ; un son demandé par plusieurs
+        # ticks de la même frame n'est lancé qu'une fois
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        if not self.channels:
+            self.skipped += len(pending)
+            return
+        names = dict.fromkeys(pending)
+        self.skipped += len(pending) - len(names)
+        for name in names:
+            voices = self.voices[name]
+            voices[:] = [i for i in voices if self.channels[i].get_busy()]
+            if len(voices) >= self.voice_limits.get(name, 1):
+                # Plafond atteint : la voix la plus ancienne de ce son est relancée
+                index = min(voices, key=self.started.__getitem__)
+                voices.remove(index)
+            else:
+                index = self.free_channel()
+            self.start(index, name)
+
+    def free_channel(self):
+        # Canal libre, sinon celui dont le son a commencé le plus tôt
+        index = next((i for i, channel in enumerate(self.channels) if not channel.get_busy()), None)
+        if index is None:
+            index = min(range(len(self.channels)), key=self.started.__getitem__)
+        # Le canal ne compte plus comme voix du son qu'il jouait
+        for voices in self.voices.values():
+            if index in voices:
+                voices.remove(index)
+        return index
+
+    def start(self, index, name):
+        self.channels[index].play(self.sounds[name])
+        self.counter += 1
+        self.started[index] = self.counter
+        self.voices[name].append(index)
+        self.played += 1
@@ -0,0 +1,318 @@
+# Banc d'essai sans affichage : coût de la mise à jour et du dessin d'une frame.
+# Utilise les pilotes SDL « dummy » (ni fenêtre ni son), charge chaque niveau du jeu et
+# des niveaux synthétiques de charge, puis mesure séparément state.step() et
+# renderer.draw() sur de nombreuses frames. Les résultats sont écrits en JSON et
+# comparés à une référence enregistrée : une régression fait échouer la commande.
+#
+#   python benchmark.py --output bench.json                   mesure
+#   python benchmark.py --save-baseline                       enregistre la référence
+#   python benchmark.py --baseline benchmarks/baseline.json   compare (code de sortie 1 si régression)
+#
+# Les durées dépendent de la machine : les références ne sont pas versionnées
+# (benchmarks/ est ignoré par git). Sans référence, la commande échoue, sauf avec
+# --allow-missing-baseline.
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from functools import partial
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from levels import generate_level, level_cache
+from prefetch import LevelPrefetcher
+from rendering import Renderer, DirtyRectRenderer
+from simulation import (GameState, WIDTH, HEIGHT, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP,
+                        INPUT_FIRE)
+from text_cache import TextCache
+
+# Références par défaut, une par rendu (les durées de dessin ne sont pas comparables)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+DIRTY_BASELINE_PATH = os.path.join(os.path.dirname(BASELINE_PATH), "baseline-dirty.json")
+
+# Niveaux du jeu mesurés
+BUILTIN_LEVELS = (1, 2, 3, 4)
+
+# Niveaux de charge : nom -> (numéro, plateformes, pièces, ennemis, largeur)
+STRESS_LEVELS = {
+    "stress-100": (9001, 100, 100, 100, WIDTH),
+    "stress-1000": (9002, 1000, 1000, 1000, WIDTH),
+    # Niveau de 50 écrans de large : seuls les chunks proches de la caméra coûtent
+    "stress-wide": (9003, 5000, 5000, 5000, WIDTH * 50),
+}
+
+# Particules vivantes entretenues dans le scénario de particules (sur le niveau 1)
+PARTICLE_STRESS = 10000
+
+# Scénario de destruction en chaîne : plateformes cassables détruites d'un coup toutes
+# les BREAK_INTERVAL frames, sur un écran de 1000 plateformes (environ 200 cassables)
+# sans pièces ni ennemis. Niveau au format de STRESS_LEVELS.
+BREAK_LEVEL = (9004, 1000, 0, 0, WIDTH)
+BREAK_CHAIN = 50
+BREAK_INTERVAL = 30
+
+# Scénario de passages de porte : deux niveaux de 30 écrans dont les portes mènent de
+# l'un à l'autre, sans pièce requise ni ennemi. Mario est placé près de la porte au milieu de
+# chaque intervalle (le niveau suivant est alors préparé en arrière-plan), puis sur la
+# porte à la fin. Niveaux au format de STRESS_LEVELS.
+TRANSITION_LEVELS = ((9005, 3000, 3000, 0, WIDTH * 30), (9006, 3000, 3000, 0, WIDTH * 30))
+TRANSITION_INTERVAL = 120
+
+# Mesures comparées à la référence
+METRICS = ("update_ms", "draw_ms")
+
+# Entrées rejouées pendant la mesure : déplacements, sauts et tirs pseudo-aléatoires
+def input_script(frames, seed):
+    rng = random.Random(seed)
+    inputs = []
+    held = INPUT_RIGHT
+    for frame in range(frames):
+        if frame % 45 == 0:
+            held = rng.choice((INPUT_LEFT, INPUT_RIGHT, INPUT_RIGHT, 0))
+        pressed = INPUT_JUMP if rng.random() < 0.05 else 0
+        pressed |= INPUT_FIRE if rng.random() < 0.05 else 0
+        inputs.append(held | pressed)
+    return inputs
+
+# Statistiques d'une série de durées en nanosecondes, en millisecondes
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "mean": statistics.fmean(samples) / 1e6,
+        "median": statistics.median(samples) / 1e6,
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))] / 1e6,
+        "max": samples[-1] / 1e6,
+    }
+
+# Mesure d'un niveau sur `frames` frames
+def run_scenario(level, renderer, frames, warmup, seed):
+    state = GameState(level, seed)
+    update_times = []
+    draw_times = []
+    clock = time.perf_counter_ns
+    for i, inputs in enumerate(input_script(warmup + frames, seed)):
+        # Une partie perdue ou gagnée est relancée sur le même niveau
+        if state.status != "playing" or state.current_level != level:
+            state.reset(level)
+        start = clock()
+        state.step(inputs)
+        renderer.particles.emit_effects(state)
+        renderer.particles.update(1 / 60)
+        middle = clock()
+        renderer.draw(state)
+        renderer.present()
+        end = clock()
+        if i >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+    return {"update_ms": summarize(update_times), "draw_ms": summarize(draw_times)}
+
+# Mesure du système de particules : `count` particules vivantes en continu, les mortes
+# étant remplacées à chaque frame par des émissions à des positions aléatoires
+def run_particles(renderer, frames, warmup, seed, count):
+    state = GameState(1, seed)
+    particles = renderer.particles
+    particles.clear()
+    particles.world = state.world
+    rng = np.random.default_rng(seed)
+    update_times = []
+    draw_times = []
+    clock = time.perf_counter_ns
+    for i in range(warmup + frames):
+        start = clock()
+        missing = count - len(particles)
+        if missing > 0:
+            particles.emit("kill", rng.uniform(0, WIDTH, missing), rng.uniform(0, HEIGHT, missing), 1)
+        particles.update(1 / 60)
+        middle = clock()
+        renderer.draw(state)
+        renderer.present()
+        end = clock()
+        if i >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+    particles.clear()
+    return {"update_ms": summarize(update_times), "draw_ms": summarize(draw_times)}
+
+# Mesure des destructions en chaîne : la frame d'une destruction ne doit pas coûter
+# plus qu'une reconstruction des zones touchées (voir max et p95)
+def run_breakables(renderer, frames, warmup, seed, level, chain, interval):
+    state = GameState(level, seed)
+    rng = random.Random(seed)
+    update_times = []
+    draw_times = []
+    clock = time.perf_counter_ns
+    for i in range(warmup + frames):
+        if state.status != "playing" or state.current_level != level:
+            state.reset(level)
+        start = clock()
+        if i % interval == 0:
+            blocks = [block for block in state.platforms if block.is_breakable]
+            if len(blocks) < chain:
+                state.reset(level)
+                blocks = [block for block in state.platforms if block.is_breakable]
+            for block in rng.sample(blocks, min(chain, len(blocks))):
+                state.break_platform(block)
+        state.step(0)
+        renderer.particles.emit_effects(state)
+        renderer.particles.update(1 / 60)
+        middle = clock()
+        renderer.draw(state)
+        renderer.present()
+        end = clock()
+        if i >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+    renderer.particles.clear()
+    return {"update_ms": summarize(update_times), "draw_ms": summarize(draw_times)}
+
+# Mesure des passages de porte avec le préchargeur de mario.py : la frame du passage
+# ne doit pas reconstruire le niveau (voir max et p95)
+def run_transitions(renderer, frames, warmup, seed, levels, interval):
+    state = GameState(levels[0], seed)
+    prefetcher = LevelPrefetcher(bake=renderer.level_layer.prebuild)
+    state.prefetcher = prefetcher
+    update_times = []
+    draw_times = []
+    clock = time.perf_counter_ns
+    for i in range(warmup + frames):
+        if state.status != "playing" or state.current_level not in levels:
+            state.reset(levels[0])
+        player = state.player
+        door = state.doors[0]
+        if i % interval == interval // 2:
+            player.x = door.x - prefetcher.distance // 2
+        elif i % interval == interval - 1:
+            player.x, player.y = door.x, door.y
+        start = clock()
+        state.step(0)
+        renderer.particles.emit_effects(state)
+        renderer.particles.update(1 / 60)
+        middle = clock()
+        renderer.draw(state)
+        renderer.present()
+        end = clock()
+        prefetcher.update(state)
+        if i >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+    renderer.particles.clear()
+    return {"update_ms": summarize(update_times), "draw_ms": summarize(draw_times)}
+
+def run_benchmarks(frames, warmup, seed, dirty_rects=False):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    fonts = [pygame.font.Font("freesansbold.ttf", size) for size in (64, 28, 20)]
+    renderer_class = DirtyRectRenderer if dirty_rects else Renderer
+    renderer = renderer_class(screen, *fonts, TextCache(), random.Random(seed))
+
+    scenarios = {}
+    for name, (number, n_platforms, n_coins, n_enemies, width) in STRESS_LEVELS.items():
+        level_cache.put(generate_level(number, n_platforms, n_coins, n_enemies, seed, width))
+    level_cache.put(generate_level(*BREAK_LEVEL[:4], seed, BREAK_LEVEL[4]))
+    for (number, *sizes, width), (next_level, *_) in zip(TRANSITION_LEVELS, TRANSITION_LEVELS[::-1]):
+        level = generate_level(number, *sizes, seed, width)
+        level.doors[:, 2] = next_level
+        level.doors[:, 3] = 0
+        level_cache.put(level)
+    levels = [(f"level-{n}", n) for n in BUILTIN_LEVELS]
+    levels += [(name, number) for name, (number, *_) in STRESS_LEVELS.items()]
+    runs = [(name, partial(run_scenario, number)) for name, number in levels]
+    runs.append((f"particles-{PARTICLE_STRESS // 1000}k", partial(run_particles, count=PARTICLE_STRESS)))
+    runs.append((f"breakables-{BREAK_CHAIN}", partial(run_breakables, level=BREAK_LEVEL[0],
+                                                      chain=BREAK_CHAIN, interval=BREAK_INTERVAL)))
+    runs.append(("transitions", partial(run_transitions, levels=[number for number, *_ in TRANSITION_LEVELS],
+                                        interval=TRANSITION_INTERVAL)))
+    for name, run in runs:
+        scenarios[name] = run(renderer, frames, warmup, seed)
+        print(f"{name:>12}: update {scenarios[name]['update_ms']['median']:.4f} ms, "
+              f"draw {scenarios[name]['draw_ms']['median']:.4f} ms (médianes)")
+    pygame.quit()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "frames": frames,
+            "seed": seed,
+            "renderer": renderer_class.__name__,
+        },
+        "scenarios": scenarios,
+    }
+
+# Comparaison des médianes avec la référence ; renvoie la liste des régressions
+def compare(results, baseline, tolerance, min_delta_ms):
+    regressions = []
+    for name, metrics in baseline["scenarios"].items():
+        current = results["scenarios"].get(name)
+        if current is None:
+            continue
+        for metric in METRICS:
+            before = metrics[metric]["median"]
+            after = current[metric]["median"]
+            if after > before * (1 + tolerance) and after - before > min_delta_ms:
+                regressions.append(f"{name} {metric}: {before:.4f} ms -> {after:.4f} ms "
+                                   f"(+{(after / before - 1) * 100 if before else float('inf'):.0f}%)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai sans affichage du jeu")
+    parser.add_argument("--frames", type=int, default=300, help="frames mesurées par niveau")
+    parser.add_argument("--warmup", type=int, default=60, help="frames ignorées au début")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--baseline", help="référence à comparer (par défaut celle du rendu mesuré)")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistre les résultats comme référence")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="sans référence, mesure sans comparer au lieu d'échouer")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="hausse relative tolérée (0.25 = 25 %%)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="hausse absolue tolérée en ms")
+    parser.add_argument("--dirty-rects", action="store_true", help="mesure le rendu par zones modifiées")
+    args = parser.parse_args(argv)
+    if args.baseline is None:
+        args.baseline = DIRTY_BASELINE_PATH if args.dirty_rects else BASELINE_PATH
+    if not (args.save_baseline or args.allow_missing_baseline or os.path.exists(args.baseline)):
+        # Échec avant la mesure : une comparaison sans référence ne vérifierait rien
+        print(f"Pas de référence ({args.baseline}) : python benchmark.py --save-baseline "
+              f"l'enregistre (--allow-missing-baseline pour mesurer sans comparer)")
+        return 2
+
+    results = run_benchmarks(args.frames, args.warmup, args.seed, args.dirty_rects)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Référence enregistrée dans {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Pas de référence ({args.baseline}) : comparaison ignorée")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    # Les références d'avant le rendu par zones modifiées n'indiquent pas leur rendu
+    expected = baseline["meta"].get("renderer", "Renderer")
+    if expected != results["meta"]["renderer"]:
+        print(f"Référence {args.baseline} mesurée avec {expected}, pas {results['meta']['renderer']} : "
+              f"comparaison impossible")
+        return 2
+    regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
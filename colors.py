@@ -0,0 +1,18 @@
+# Couleurs partagées par le rendu du jeu et les menus
+
+# Définition des couleurs utilisées dans le jeu
+SKY_BLUE = (135, 206, 250)  # Bleu ciel pour le fond
+WHITE = (255, 255, 255)     # Blanc
+BLACK = (0, 0, 0)           # Noir
+RED = (220, 0, 0)           # Rouge (pour Mario)
+DARK_RED = (180, 0, 0)      # Rouge foncé (ombres de Mario)
+YELLOW = (255, 215, 0)      # Jaune (pour les pièces)
+GOLD = (255, 165, 0)        # Or (pour les pièces)
+GREEN = (76, 175, 80)       # Vert (pour les plateformes)
+DARK_GREEN = (0, 100, 0)    # Vert foncé (ombres des plateformes)
+BROWN = (139, 69, 19)       # Marron (pour les portes)
+DARK_BROWN = (100, 50, 0)   # Marron foncé (ombres des portes)
+MARIO_BLUE = (30, 144, 255) # Bleu (pour les vêtements de Mario)
+DARK_BLUE = (20, 100, 200)  # Bleu foncé
+ORANGE = (255, 140, 0)      # Orange (pour les ennemis)
+GRAY = (128, 128, 128, 150) # Gris semi-transparent
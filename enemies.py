@@ -0,0 +1,155 @@
+# Moteur des ennemis en structure de tableaux NumPy.
+# Positions, vitesses, directions, bornes de patrouille et types sont rangés dans des
+# tableaux : toutes les patrouilles avancent en une seule opération vectorisée et les
+# collisions candidates sont calculées en bloc. Une grille de colonnes (largeur
+# CELL_SIZE, comme l'index spatial) limite chaque test de collision aux ennemis qui
+# patrouillent dans les colonnes touchées.
+import numpy as np
+
+from spatial import CELL_SIZE
+
+# Nombre de candidats au-delà duquel le test de collision est vectorisé (en deçà,
+# une boucle Python coûte moins que les opérations NumPy)
+CROWDED = 48
+
+# Types d'ennemis, rangés par code dans le tableau `type`
+ENEMY_TYPES = ("goomba", "koopa")
+
+# Dimensions communes des ennemis
+ENEMY_WIDTH = 30
+ENEMY_HEIGHT = 30
+ENEMY_DEPTH = 10
+
+class EnemyManager:
+    def __init__(self, x=(), y=(), speed=(), min_x=(), max_x=(), types=()):
+        self.x = np.array(x, dtype=np.float64)          # Position horizontale
+        self.y = np.array(y, dtype=np.float64)          # Position verticale
+        self.speed = np.array(speed, dtype=np.float64)  # Vitesse de patrouille
+        self.min_x = np.array(min_x, dtype=np.float64)  # Borne gauche de la patrouille
+        self.max_x = np.array(max_x, dtype=np.float64)  # Borne droite de la patrouille
+        self.type = np.array(types, dtype=np.int8)      # Code du type (indice dans ENEMY_TYPES)
+        count = len(self.x)
+        self.direction = np.ones(count)                 # 1 vers la droite, -1 vers la gauche
+        self.animation_frame = np.zeros(count)          # Frame d'animation (oscillation)
+        self.alive = np.ones(count, dtype=bool)         # Faux pour un ennemi tué pendant ce tick
+        self.width = ENEMY_WIDTH
+        self.height = ENEMY_HEIGHT
+        self.dead = 0                                   # Ennemis tués en attente de suppression
+        self.generation = 0                             # Incrémenté quand les indices changent
+        self.grid = None                                # Voir cells(), à refaire quand les indices changent
+
+    def __len__(self):
+        return len(self.x)
+
+    def update(self):
+        # Déplacement de tous les ennemis (va-et-vient) en une seule passe
+        self.x += self.speed * self.direction
+        at_left = self.x <= self.min_x
+        at_right = (self.x + self.width >= self.max_x) & ~at_left
+        self.direction[at_left] = 1
+        self.direction[at_right] = -1
+        # Animation de l'ennemi (oscillation)
+        self.animation_frame += 0.1
+
+    def cells(self):
+        # Grille des ennemis : colonne -> indices (croissants) des ennemis dont la patrouille
+        # passe par cette colonne. Un ennemi ne sort jamais de ses bornes de plus d'un pas
+        # (ni de sa position de départ, s'il en est hors) : la grille reste valable tant que
+        # les indices ne changent pas, sans être refaite à chaque tick.
+        if self.grid is None:
+            margin = self.speed + 1
+            first = (np.minimum(self.x, self.min_x) - margin) // CELL_SIZE
+            last = (np.maximum(self.x + self.width, self.max_x) + margin) // CELL_SIZE
+            grid = {}
+            for i, (start, end) in enumerate(zip(first.tolist(), last.tolist())):
+                for column in range(int(start), int(end) + 1):
+                    grid.setdefault(column, []).append(i)
+            self.grid = grid
+        return self.grid
+
+    def overlapping(self, x, y, width, height):
+        # Indices des ennemis vivants qui chevauchent le rectangle, dans l'ordre du niveau.
+        # Seuls les ennemis qui patrouillent dans les colonnes du rectangle sont testés.
+        grid = self.cells()
+        first = int(x // CELL_SIZE)
+        last = int((x + width) // CELL_SIZE)
+        if first == last:
+            candidates = grid.get(first, ())
+        else:
+            candidates = sorted({i for column in range(first, last + 1)
+                                 for i in grid.get(column, ())})
+        if len(candidates) > CROWDED:
+            # Colonnes très peuplées : test vectorisé
+            candidates = np.array(candidates)
+            ex = self.x[candidates]
+            ey = self.y[candidates]
+            hit = ((x + width > ex) & (x < ex + self.width) &
+                   (y + height > ey) & (y < ey + self.height) & self.alive[candidates])
+            return candidates[hit].tolist()
+        ex = self.x
+        ey = self.y
+        alive = self.alive
+        left = x - self.width
+        right = x + width
+        top = y - self.height
+        bottom = y + height
+        return [i for i in candidates
+                if left < ex[i] < right and top < ey[i] < bottom and alive[i]]
+
+    def kill(self, index):
+        # L'ennemi reste en place jusqu'à compact(), pour ne pas décaler les indices
+        if self.alive[index]:
+            self.alive[index] = False
+            self.dead += 1
+
+    def compact(self):
+        # Suppression des ennemis tués par masquage de tous les tableaux
+        if not self.dead:
+            return
+        keep = self.alive
+        self.x = self.x[keep]
+        self.y = self.y[keep]
+        self.speed = self.speed[keep]
+        self.min_x = self.min_x[keep]
+        self.max_x = self.max_x[keep]
+        self.type = self.type[keep]
+        self.direction = self.direction[keep]
+        self.animation_frame = self.animation_frame[keep]
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.dead = 0
+        self.generation += 1
+        self.grid = None
+
+    # Tableaux déplacés par extract() et extend()
+    FIELDS = ("x", "y", "speed", "min_x", "max_x", "type", "direction", "animation_frame")
+
+    def extract(self, mask):
+        # Retire les ennemis du masque et renvoie leurs tableaux (ennemis suspendus).
+        # À appeler entre deux ticks, quand aucun ennemi n'attend compact().
+        rows = {}
+        keep = ~mask
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            rows[name] = array[mask]
+            setattr(self, name, array[keep])
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.generation += 1
+        self.grid = None
+        return rows
+
+    def extend(self, rows):
+        # Remet dans le moteur des ennemis retirés par extract()
+        for name in self.FIELDS:
+            setattr(self, name, np.concatenate((getattr(self, name), rows[name])))
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.generation += 1
+        self.grid = None
+
+    def records(self, x=None):
+        # (x, y, type, frame) de chaque ennemi vivant, pour le rendu.
+        # `x` remplace les positions horizontales (positions interpolées).
+        keep = self.alive
+        x = self.x if x is None else x
+        return zip(x[keep].tolist(), self.y[keep].tolist(),
+                   [ENEMY_TYPES[code] for code in self.type[keep].tolist()],
+                   self.animation_frame[keep].tolist())
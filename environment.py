@@ -0,0 +1,494 @@
+# Environnements d'entraînement et d'évaluation pour joueurs automatiques, sur le modèle
+# de l'API Gymnasium (reset() / step(action) -> observation, récompense, terminé,
+# tronqué, infos), sans dépendre de gymnasium.
+#
+# MarioEnv enveloppe un GameState : règles exactes du jeu, une partie à la fois.
+# VectorMarioEnv fait avancer N parties en un seul appel : tout l'état est rangé dans des
+# tableaux NumPy (N, ...) et les règles du tick sont appliquées en bloc, sans objet Python
+# par partie. Les observations sont écrites dans un tampon préalloué.
+#
+# Écarts connus de VectorMarioEnv avec GameState, sans effet sur les niveaux du jeu :
+# - niveaux d'un seul écran uniquement (pas de caméra) ;
+# - au plus une plateforme (la première dans l'ordre du niveau) arrête une chute par tick ;
+# - au plus une perte de vie par tick, même si plusieurs ennemis touchent Mario ;
+# - deux boules de feu qui touchent le même ennemi dans le même tick disparaissent toutes
+#   les deux ;
+# - MAX_FIREBALLS boules de feu par partie au lieu du pool de FIREBALL_CAPACITY.
+import argparse
+import time
+
+import numpy as np
+
+from enemies import ENEMY_WIDTH, ENEMY_HEIGHT
+from levels import level_cache
+from projectiles import FIREBALL_SIZE
+from simulation import (GameState, WIDTH, HEIGHT, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP,
+                        INPUT_FIRE)
+
+# Actions : masques d'entrées limités au déplacement, au saut et au tir
+ACTION_MASK = INPUT_LEFT | INPUT_RIGHT | INPUT_JUMP | INPUT_FIRE
+ACTION_COUNT = ACTION_MASK + 1
+
+# Observation : joueur, ennemis les plus proches, pièce la plus proche, porte
+NEAREST_ENEMIES = 3
+OBS_SIZE = 8 + 3 * NEAREST_ENEMIES + 3 + 3
+
+# Durée maximale d'un épisode (en ticks) avant troncature
+MAX_STEPS = 5000
+
+# Boules de feu simultanées par partie dans VectorMarioEnv (une toutes les 20 ticks,
+# sorties de l'écran en moins de 80 ticks : 5 au plus en pratique)
+MAX_FIREBALLS = 8
+
+# Constantes du joueur (voir simulation.Player)
+PLAYER_WIDTH = 40
+PLAYER_HEIGHT = 60
+PLAYER_SPEED = 5
+JUMP_POWER = -15
+GRAVITY = 0.8
+SPAWN_X = 100
+SPAWN_Y = HEIGHT - 150
+THROW_COOLDOWN = 20
+START_LIVES = 3
+PLATFORM_HEIGHT = 20
+COIN_SIZE = 20
+DOOR_WIDTH = 40
+DOOR_HEIGHT = 60
+FIREBALL_SPEED = 10
+
+# Niveau où la porte vers VICTORY_LEVEL termine la partie
+FINAL_LEVEL = 3
+VICTORY_LEVEL = 4
+
+# Remplissage de l'observation à partir des positions relatives (en écrans)
+def fill_observation(out, x, y, vel_y, is_jumping, facing_right, lives, coins_collected, can_throw,
+                     enemy_dx, enemy_dy, coin_dx, coin_dy, door_dx, door_dy, door_open):
+    out[..., 0] = x / WIDTH
+    out[..., 1] = y / HEIGHT
+    out[..., 2] = vel_y / -JUMP_POWER
+    out[..., 3] = is_jumping
+    out[..., 4] = facing_right
+    out[..., 5] = lives
+    out[..., 6] = coins_collected
+    out[..., 7] = can_throw
+    # Ennemis : (dx, dy, présent), du plus proche au plus lointain
+    enemies = out[..., 8:8 + 3 * NEAREST_ENEMIES]
+    enemies[..., 0::3] = enemy_dx / WIDTH
+    enemies[..., 1::3] = enemy_dy / HEIGHT
+    enemies[..., 2::3] = np.isfinite(enemy_dx)
+    np.nan_to_num(enemies, copy=False, posinf=0.0, neginf=0.0)
+    end = 8 + 3 * NEAREST_ENEMIES
+    coin_present = np.isfinite(coin_dx)
+    out[..., end] = np.where(coin_present, coin_dx, 0.0) / WIDTH
+    out[..., end + 1] = np.where(coin_present, coin_dy, 0.0) / HEIGHT
+    out[..., end + 2] = coin_present
+    out[..., end + 3] = door_dx / WIDTH
+    out[..., end + 4] = door_dy / HEIGHT
+    out[..., end + 5] = door_open
+
+# Écarts (dx, dy) des `count` entités les plus proches, inf pour les places vides.
+# `dx` et `dy` : (..., E) avec inf pour les entités absentes. À distance égale, l'ordre
+# se fait sur dx puis dy, pas sur l'ordre des entités : MarioEnv (pièces rangées par
+# chunk, ennemis déplacés par le streaming) et VectorMarioEnv (ordre du niveau) donnent
+# la même observation.
+def nearest(dx, dy, count):
+    distance = np.abs(dx) + np.abs(dy)
+    size = distance.shape[-1]
+    if size < count:
+        pad = [(0, 0)] * (distance.ndim - 1) + [(0, count - size)]
+        dx = np.pad(dx, pad, constant_values=np.inf)
+        dy = np.pad(dy, pad, constant_values=np.inf)
+        distance = np.pad(distance, pad, constant_values=np.inf)
+    order = np.lexsort((dy, dx, distance), axis=-1)[..., :count]
+    return np.take_along_axis(dx, order, -1), np.take_along_axis(dy, order, -1)
+
+# Observation d'un GameState, écrite dans `out` (OBS_SIZE,)
+def observe_state(state, out):
+    player = state.player
+    enemies = state.enemies
+    alive = enemies.alive
+    enemy_dx, enemy_dy = nearest(enemies.x[alive] - player.x, enemies.y[alive] - player.y,
+                                 NEAREST_ENEMIES)
+    coins = np.array([(coin.x, coin.y) for coin in state.world.coins()], np.float64).reshape(-1, 2)
+    coin_dx, coin_dy = nearest(coins[:, 0] - player.x, coins[:, 1] - player.y, 1)
+    door = state.doors[0] if state.doors else None
+    fill_observation(out, player.x, player.y, player.vel_y, player.is_jumping,
+                     player.facing_right, player.lives, player.coins_collected,
+                     player.can_throw, enemy_dx, enemy_dy, coin_dx[0], coin_dy[0],
+                     door.x - player.x if door else 0.0, door.y - player.y if door else 0.0,
+                     door is not None and player.coins_collected >= door.coins_required)
+    return out
+
+# Partie unique, règles exactes de GameState
+class MarioEnv:
+    def __init__(self, level=1, max_steps=MAX_STEPS):
+        self.level = level
+        self.max_steps = max_steps
+        self.state = None
+        self.steps = 0
+        self.observation = np.zeros(OBS_SIZE, np.float32)
+
+    def reset(self, seed=None):
+        self.state = GameState(self.level, seed)
+        self.steps = 0
+        return self.observe(), {}
+
+    def step(self, action):
+        state = self.state
+        score = state.player.score
+        events = state.step(int(action) & ACTION_MASK)
+        self.steps += 1
+        reward = state.player.score - score
+        terminated = state.status != "playing"
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        info = {"events": events, "level": state.current_level, "status": state.status}
+        return self.observe(), reward, terminated, truncated, info
+
+    def observe(self):
+        return observe_state(self.state, self.observation)
+
+# Tables des niveaux atteignables depuis `start`, complétées à la même taille
+class LevelTables:
+    def __init__(self, start, cache=level_cache):
+        numbers = []
+        pending = [start]
+        while pending:
+            number = pending.pop()
+            if number in numbers or (number == VICTORY_LEVEL and FINAL_LEVEL in numbers):
+                continue
+            level = cache.get(number)
+            if level.width > WIDTH:
+                raise ValueError(f"Niveau {number} plus large que l'écran : non géré par VectorMarioEnv")
+            numbers.append(number)
+            pending.extend(level.doors[:, 2].tolist())
+        levels = [cache.get(number) for number in numbers]
+        self.numbers = np.array(numbers)
+        self.rows = {number: row for row, number in enumerate(numbers)}
+
+        def table(arrays, columns, fill=0):
+            size = max(1, max(len(array) for array in arrays))
+            out = np.full((len(arrays), size, columns), fill, np.float64)
+            valid = np.zeros((len(arrays), size), bool)
+            for row, array in enumerate(arrays):
+                if len(array):
+                    out[row, :len(array)] = array.reshape(len(array), -1)[:, :columns]
+                    valid[row, :len(array)] = True
+            return out, valid
+
+        self.platforms, self.platform_valid = table([level.platforms for level in levels], 4)
+        self.coins, self.coin_valid = table([level.coins for level in levels], 2)
+        self.doors, self.door_valid = table([level.doors for level in levels], 4)
+        self.enemies, self.enemy_valid = table([level.enemies for level in levels], 4)
+        self.enemy_speeds, _ = table([level.enemy_speeds for level in levels], 1)
+        self.enemy_speeds = self.enemy_speeds[..., 0]
+
+# N parties avancées en bloc
+class VectorMarioEnv:
+    def __init__(self, num_envs, level=1, max_steps=MAX_STEPS, cache=level_cache):
+        self.num_envs = num_envs
+        self.level = level
+        self.max_steps = max_steps
+        self.tables = tables = LevelTables(level, cache)
+        n = num_envs
+        # Joueur
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.vel_y = np.zeros(n)
+        self.is_jumping = np.zeros(n, bool)
+        self.facing_right = np.zeros(n, bool)
+        self.score = np.zeros(n, np.int64)
+        self.coins_collected = np.zeros(n, np.int64)
+        self.lives = np.zeros(n, np.int64)
+        self.can_throw = np.zeros(n, bool)
+        self.throw_cooldown = np.zeros(n, np.int64)
+        self.steps = np.zeros(n, np.int64)
+        # Niveau courant : numéro et ligne dans les tables
+        self.current_level = np.zeros(n, np.int64)
+        self.row = np.zeros(n, np.int64)
+        # Copies par partie des entités du niveau courant
+        self.platforms = np.zeros((n,) + tables.platforms.shape[1:])
+        self.platform_valid = np.zeros((n,) + tables.platform_valid.shape[1:], bool)
+        self.coins = np.zeros((n,) + tables.coins.shape[1:])
+        self.coin_active = np.zeros((n,) + tables.coin_valid.shape[1:], bool)
+        self.doors = np.zeros((n,) + tables.doors.shape[1:])
+        self.door_valid = np.zeros((n,) + tables.door_valid.shape[1:], bool)
+        shape = (n,) + tables.enemy_valid.shape[1:]
+        self.enemy_x = np.zeros(shape)
+        self.enemy_y = np.zeros(shape)
+        self.enemy_speed = np.zeros(shape)
+        self.enemy_min_x = np.zeros(shape)
+        self.enemy_max_x = np.zeros(shape)
+        self.enemy_direction = np.ones(shape)
+        self.enemy_alive = np.zeros(shape, bool)
+        # Boules de feu
+        self.fireball_x = np.zeros((n, MAX_FIREBALLS))
+        self.fireball_y = np.zeros((n, MAX_FIREBALLS))
+        self.fireball_speed = np.zeros((n, MAX_FIREBALLS))
+        self.fireball_active = np.zeros((n, MAX_FIREBALLS), bool)
+        # Tampons de sortie, réutilisés à chaque appel
+        self.observations = np.zeros((n, OBS_SIZE), np.float32)
+        self.rewards = np.zeros(n, np.float32)
+        self.terminated = np.zeros(n, bool)
+        self.truncated = np.zeros(n, bool)
+        self.victory = np.zeros(n, bool)
+
+    def reset(self, seed=None):
+        # Les règles sont déterministes : `seed` n'est accepté que pour l'API
+        self.reset_envs(np.arange(self.num_envs))
+        return self.observe(), {}
+
+    def reset_envs(self, envs):
+        self.x[envs] = SPAWN_X
+        self.y[envs] = SPAWN_Y
+        self.vel_y[envs] = 0
+        self.is_jumping[envs] = False
+        self.facing_right[envs] = True
+        self.score[envs] = 0
+        self.coins_collected[envs] = 0
+        self.lives[envs] = START_LIVES
+        self.can_throw[envs] = True
+        self.throw_cooldown[envs] = THROW_COOLDOWN
+        self.steps[envs] = 0
+        self.fireball_active[envs] = False
+        self.load(envs, np.full(len(envs), self.level))
+
+    def load(self, envs, levels):
+        # Chargement du niveau `levels[i]` pour la partie `envs[i]`
+        tables = self.tables
+        rows = np.array([tables.rows[level] for level in levels.tolist()], np.int64)
+        self.current_level[envs] = levels
+        self.row[envs] = rows
+        self.platforms[envs] = tables.platforms[rows]
+        self.platform_valid[envs] = tables.platform_valid[rows]
+        self.coins[envs] = tables.coins[rows]
+        self.coin_active[envs] = tables.coin_valid[rows]
+        self.doors[envs] = tables.doors[rows]
+        self.door_valid[envs] = tables.door_valid[rows]
+        enemies = tables.enemies[rows]
+        self.enemy_x[envs] = enemies[..., 0]
+        self.enemy_y[envs] = enemies[..., 1]
+        self.enemy_min_x[envs] = enemies[..., 2]
+        self.enemy_max_x[envs] = enemies[..., 3]
+        self.enemy_speed[envs] = tables.enemy_speeds[rows]
+        self.enemy_direction[envs] = 1
+        self.enemy_alive[envs] = tables.enemy_valid[rows]
+
+    def step(self, actions):
+        # Avance toutes les parties d'un tick. `actions` : masques d'entrées (N,).
+        # Les parties terminées ou tronquées repartent aussitôt du niveau de départ.
+        actions = np.asarray(actions) & ACTION_MASK
+        score_before = self.score.copy()
+        x, y, vel_y = self.x, self.y, self.vel_y
+        self.terminated[:] = False
+        self.victory[:] = False
+        self.steps += 1
+
+        # Saut
+        jump = (actions & INPUT_JUMP).astype(bool) & ~self.is_jumping
+        vel_y[jump] = JUMP_POWER
+        self.is_jumping |= jump
+
+        # Tir dans la première case libre (rien si toutes sont prises)
+        fire = (actions & INPUT_FIRE).astype(bool) & self.can_throw
+        free = ~self.fireball_active
+        fire &= free.any(axis=1)
+        if fire.any():
+            envs = np.flatnonzero(fire)
+            slots = free[envs].argmax(axis=1)
+            facing = self.facing_right[envs]
+            self.fireball_x[envs, slots] = np.where(facing, x[envs] + PLAYER_WIDTH, x[envs] - 10)
+            self.fireball_y[envs, slots] = y[envs] + PLAYER_HEIGHT // 2 - 5
+            self.fireball_speed[envs, slots] = np.where(facing, FIREBALL_SPEED, -FIREBALL_SPEED)
+            self.fireball_active[envs, slots] = True
+            self.can_throw[envs] = False
+
+        # Déplacement horizontal
+        left = (actions & INPUT_LEFT).astype(bool)
+        right = (actions & INPUT_RIGHT).astype(bool)
+        x -= left * PLAYER_SPEED
+        x += right * PLAYER_SPEED
+        self.facing_right[left] = False
+        self.facing_right[right] = True
+
+        # Patrouilles des ennemis
+        self.enemy_x += self.enemy_speed * self.enemy_direction
+        at_left = self.enemy_x <= self.enemy_min_x
+        at_right = (self.enemy_x + ENEMY_WIDTH >= self.enemy_max_x) & ~at_left
+        self.enemy_direction[at_left] = 1
+        self.enemy_direction[at_right] = -1
+
+        # Gravité et sol
+        vel_y += GRAVITY
+        y += vel_y
+        ground = y > HEIGHT - PLAYER_HEIGHT
+        y[ground] = HEIGHT - PLAYER_HEIGHT
+        vel_y[ground] = 0
+        self.is_jumping[ground] = False
+
+        # Coups de tête dans les plateformes cassables : elles disparaissent et Mario retombe
+        px, py, pw = self.platforms[..., 0], self.platforms[..., 1], self.platforms[..., 2]
+        breakable = self.platform_valid & (self.platforms[..., 3] > 0)
+        rising = vel_y < 0
+        if rising.any():
+            head = (breakable & rising[:, None] & (y[:, None] >= py) & (y[:, None] <= py + PLATFORM_HEIGHT) &
+                    ((x + PLAYER_WIDTH)[:, None] > px) & (x[:, None] < px + pw))
+            count = head.sum(axis=1)
+            self.platform_valid &= ~head
+            breakable &= ~head
+            vel_y[count > 0] = 0
+            self.score += 50 * count
+
+        # Atterrissage sur la première plateforme qui arrête la chute
+        feet = (y + PLAYER_HEIGHT)[:, None]
+        land = (self.platform_valid & (feet >= py) & (feet <= py + PLATFORM_HEIGHT) &
+                ((x + PLAYER_WIDTH)[:, None] > px) & (x[:, None] < px + pw) & (vel_y >= 0)[:, None])
+        landed = land.any(axis=1)
+        if landed.any():
+            envs = np.flatnonzero(landed)
+            y[envs] = py[envs, land[envs].argmax(axis=1)] - PLAYER_HEIGHT
+            vel_y[envs] = 0
+            self.is_jumping[envs] = False
+
+        # Pièces
+        cx, cy = self.coins[..., 0], self.coins[..., 1]
+        taken = (self.coin_active & ((x + PLAYER_WIDTH)[:, None] > cx) & (x[:, None] < cx + COIN_SIZE) &
+                 ((y + PLAYER_HEIGHT)[:, None] > cy) & (y[:, None] < cy + COIN_SIZE))
+        self.coin_active &= ~taken
+        count = taken.sum(axis=1)
+        self.score += 100 * count
+        self.coins_collected += count
+
+        # Ennemis : le premier touché est écrasé si Mario tombe dessus, sinon (ou s'il en
+        # touche un second) Mario perd une vie et revient au départ
+        ex, ey = self.enemy_x, self.enemy_y
+        touching = (self.enemy_alive & ((x + PLAYER_WIDTH)[:, None] > ex) & (x[:, None] < ex + ENEMY_WIDTH) &
+                    ((y + PLAYER_HEIGHT)[:, None] > ey) & (y[:, None] < ey + ENEMY_HEIGHT))
+        touched = touching.sum(axis=1)
+        done = np.zeros(self.num_envs, bool)  # Parties dont le tick s'arrête ici
+        if touched.any():
+            envs = np.flatnonzero(touched)
+            first = touching[envs].argmax(axis=1)
+            stomp = (vel_y[envs] > 0) & (y[envs] + PLAYER_HEIGHT < ey[envs, first] + ENEMY_HEIGHT / 2)
+            stomped = envs[stomp]
+            self.enemy_alive[stomped, first[stomp]] = False
+            vel_y[stomped] = JUMP_POWER / 2
+            self.score[stomped] += 200
+            hit = envs[~stomp | (touched[envs] >= 2)]
+            self.lives[hit] -= 1
+            x[hit] = SPAWN_X
+            y[hit] = SPAWN_Y
+            vel_y[hit] = 0
+            over = hit[self.lives[hit] <= 0]
+            self.terminated[over] = True
+            done[over] = True
+
+        # Portes
+        dx, dy = self.doors[..., 0], self.doors[..., 1]
+        entering = (self.door_valid & ~done[:, None] &
+                    ((x + PLAYER_WIDTH)[:, None] > dx) & (x[:, None] < dx + DOOR_WIDTH) &
+                    ((y + PLAYER_HEIGHT)[:, None] > dy) & (y[:, None] < dy + DOOR_HEIGHT) &
+                    (self.coins_collected[:, None] >= self.doors[..., 3]))
+        through = entering.any(axis=1)
+        if through.any():
+            envs = np.flatnonzero(through)
+            next_level = self.doors[envs, entering[envs].argmax(axis=1), 2].astype(np.int64)
+            won = (self.current_level[envs] == FINAL_LEVEL) & (next_level == VICTORY_LEVEL)
+            self.victory[envs[won]] = True
+            self.terminated[envs[won]] = True
+            moving = envs[~won]
+            if len(moving):
+                self.load(moving, next_level[~won])
+                x[moving] = SPAWN_X
+                y[moving] = SPAWN_Y
+                vel_y[moving] = 0
+                self.is_jumping[moving] = False
+            done |= through
+
+        # Boules de feu (parties dont le tick continue)
+        active = self.fireball_active & ~done[:, None]
+        self.fireball_x[active] += self.fireball_speed[active]
+        fx, fy = self.fireball_x, self.fireball_y
+        active &= (fx >= 0) & (fx <= WIDTH)
+        self.fireball_active &= active | done[:, None]
+        hits = (active[:, :, None] & self.enemy_alive[:, None, :] &
+                (fx[:, :, None] + FIREBALL_SIZE > ex[:, None, :]) & (fx[:, :, None] < ex[:, None, :] + ENEMY_WIDTH) &
+                (fy[:, :, None] + FIREBALL_SIZE > ey[:, None, :]) & (fy[:, :, None] < ey[:, None, :] + ENEMY_HEIGHT))
+        hit_any = hits.any(axis=2)
+        if hit_any.any():
+            envs, slots = np.nonzero(hit_any)
+            targets = hits[envs, slots].argmax(axis=1)
+            alive_before = self.enemy_alive.sum(axis=1)
+            self.enemy_alive[envs, targets] = False
+            self.score += 300 * (alive_before - self.enemy_alive.sum(axis=1))
+            self.fireball_active[envs, slots] = False
+
+        # Boules de feu contre les plateformes cassables : toutes celles qui en touchent
+        # une disparaissent, chaque plateforme touchée est détruite
+        active &= self.fireball_active
+        hits = (active[:, :, None] & breakable[:, None, :] &
+                (fx[:, :, None] + FIREBALL_SIZE > px[:, None, :]) & (fx[:, :, None] < (px + pw)[:, None, :]) &
+                (fy[:, :, None] + FIREBALL_SIZE > py[:, None, :]) & (fy[:, :, None] < (py + PLATFORM_HEIGHT)[:, None, :]))
+        if hits.any():
+            broken = hits.any(axis=1)
+            self.platform_valid &= ~broken
+            self.score += 50 * broken.sum(axis=1)
+            self.fireball_active &= ~hits.any(axis=2)
+
+        # Délai entre deux tirs
+        cooling = ~self.can_throw & ~done
+        self.throw_cooldown[cooling] -= 1
+        ready = cooling & (self.throw_cooldown <= 0)
+        self.can_throw[ready] = True
+        self.throw_cooldown[ready] = THROW_COOLDOWN
+
+        np.subtract(self.score, score_before, out=self.rewards, casting="unsafe")
+        if self.max_steps is not None:
+            np.greater_equal(self.steps, self.max_steps, out=self.truncated)
+            self.truncated &= ~self.terminated
+        finished = self.terminated | self.truncated
+        info = {"level": self.current_level.copy(), "victory": self.victory.copy()}
+        if finished.any():
+            envs = np.flatnonzero(finished)
+            info["final_score"] = np.where(finished, self.score, 0)
+            self.reset_envs(envs)
+        return self.observe(), self.rewards, self.terminated, self.truncated, info
+
+    def observe(self):
+        x, y = self.x, self.y
+        enemy_dx = np.where(self.enemy_alive, self.enemy_x - x[:, None], np.inf)
+        enemy_dy = np.where(self.enemy_alive, self.enemy_y - y[:, None], np.inf)
+        enemy_dx, enemy_dy = nearest(enemy_dx, enemy_dy, NEAREST_ENEMIES)
+        coin_dx = np.where(self.coin_active, self.coins[..., 0] - x[:, None], np.inf)
+        coin_dy = np.where(self.coin_active, self.coins[..., 1] - y[:, None], np.inf)
+        coin_dx, coin_dy = nearest(coin_dx, coin_dy, 1)
+        has_door = self.door_valid[:, 0]
+        fill_observation(self.observations, x, y, self.vel_y, self.is_jumping, self.facing_right,
+                         self.lives, self.coins_collected, self.can_throw, enemy_dx, enemy_dy,
+                         coin_dx[:, 0], coin_dy[:, 0],
+                         np.where(has_door, self.doors[:, 0, 0] - x, 0.0),
+                         np.where(has_door, self.doors[:, 0, 1] - y, 0.0),
+                         has_door & (self.coins_collected >= self.doors[:, 0, 3]))
+        return self.observations
+
+# Mesure du débit : python environment.py --envs 4096 --steps 1000
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Débit de VectorMarioEnv")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env = VectorMarioEnv(args.envs, args.level)
+    env.reset()
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, ACTION_COUNT, (args.steps, args.envs))
+    episodes = 0
+    start = time.perf_counter()
+    for step_actions in actions:
+        _, _, terminated, truncated, _ = env.step(step_actions)
+        episodes += int(terminated.sum() + truncated.sum())
+    elapsed = time.perf_counter() - start
+    total = args.envs * args.steps
+    print(f"{total} pas en {elapsed:.2f} s : {total / elapsed:,.0f} pas/s "
+          f"({args.envs} parties, {episodes} épisodes terminés)")
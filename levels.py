@@ -0,0 +1,180 @@
+# Niveaux décrits dans des fichiers JSON (levels/levelN.json) et compilés une fois
+# dans un format binaire compact : un en-tête suivi de tableaux d'entiers et de flottants,
+# relus d'un bloc avec numpy.frombuffer, sans analyse objet par objet.
+# Les niveaux compilés restent en mémoire : les réinitialisations et les passages de
+# porte les réutilisent au lieu de relire et reconstruire le niveau.
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+from enemies import ENEMY_TYPES
+
+# Dossier des fichiers de niveaux
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+
+# En-tête du format compilé : signature, version, numéro du niveau, nombre de
+# plateformes, de pièces, de portes et d'ennemis (24 octets, multiple de 8)
+MAGIC = b"MLVL"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")
+
+# Code de type d'ennemi tiré au hasard à chaque chargement
+RANDOM_TYPE = -1
+
+# Niveau compilé : tableaux en lecture seule, partagés par toutes les parties
+class CompiledLevel:
+    def __init__(self, number, platforms, coins, doors, enemies, enemy_speeds):
+        self.number = number
+        self.platforms = platforms        # int32 (n, 4) : x, y, largeur, cassable
+        self.coins = coins                # int32 (n, 2) : x, y
+        self.doors = doors                # int32 (n, 4) : x, y, niveau suivant, pièces requises
+        self.enemies = enemies            # int32 (n, 5) : x, y, min_x, max_x, code du type
+        self.enemy_speeds = enemy_speeds  # float64 (n,) : vitesse de patrouille
+
+    @property
+    def width(self):
+        # Largeur occupée par le niveau : bord droit de l'entité la plus à droite
+        # (pièces de 20 pixels, portes de 40)
+        return int(max((self.platforms[:, 0] + self.platforms[:, 2]).max(initial=0),
+                       (self.coins[:, 0] + 20).max(initial=0),
+                       (self.doors[:, 0] + 40).max(initial=0),
+                       self.enemies[:, 3].max(initial=0)))
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.number, len(self.platforms), len(self.coins),
+                             len(self.doors), len(self.enemies))
+        # Les flottants viennent juste après l'en-tête pour rester alignés sur 8 octets
+        return b"".join([header, self.enemy_speeds.tobytes(), self.platforms.tobytes(),
+                         self.coins.tobytes(), self.doors.tobytes(), self.enemies.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, number, n_platforms, n_coins, n_doors, n_enemies = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Format de niveau compilé inconnu")
+        offset = HEADER.size
+
+        def take(dtype, count, columns=None):
+            nonlocal offset
+            size = count * (columns or 1)
+            array = np.frombuffer(data, dtype=dtype, count=size, offset=offset)
+            offset += array.nbytes
+            return array.reshape(count, columns) if columns else array
+
+        enemy_speeds = take(np.float64, n_enemies)
+        platforms = take(np.int32, n_platforms, 4)
+        coins = take(np.int32, n_coins, 2)
+        doors = take(np.int32, n_doors, 4)
+        enemies = take(np.int32, n_enemies, 5)
+        return cls(number, platforms, coins, doors, enemies, enemy_speeds)
+
+# Niveau vide (numéro de niveau inconnu)
+def empty_level(number):
+    return CompiledLevel(number, np.zeros((0, 4), np.int32), np.zeros((0, 2), np.int32),
+                         np.zeros((0, 4), np.int32), np.zeros((0, 5), np.int32),
+                         np.zeros(0, np.float64))
+
+# Compilation d'une description JSON de niveau
+def compile_level(description):
+    number = description["number"]
+    platforms = [(p["x"], p["y"], p["width"], int(p.get("breakable", False)))
+                 for p in description.get("platforms", [])]
+    coins = [(c["x"], c["y"]) for c in description.get("coins", [])]
+    doors = [(d["x"], d["y"], d["next_level"], d["coins_required"])
+             for d in description.get("doors", [])]
+    enemies = [(e["x"], e["y"], e["min_x"], e["max_x"],
+                ENEMY_TYPES.index(e["type"]) if "type" in e else RANDOM_TYPE)
+               for e in description.get("enemies", [])]
+    # La vitesse augmente avec le niveau, sauf si elle est donnée explicitement
+    speeds = [e.get("speed", 1 + number * 0.5) for e in description.get("enemies", [])]
+    return CompiledLevel(number,
+                         np.array(platforms, np.int32).reshape(-1, 4),
+                         np.array(coins, np.int32).reshape(-1, 2),
+                         np.array(doors, np.int32).reshape(-1, 4),
+                         np.array(enemies, np.int32).reshape(-1, 5),
+                         np.array(speeds, np.float64))
+
+# Génération d'un niveau synthétique (tests de charge) de taille width x height
+def generate_level(number, n_platforms, n_coins, n_enemies, seed=0, width=800, height=600):
+    rng = np.random.default_rng(seed)
+    # Sol sur toute la largeur, puis plateformes au hasard
+    platforms = np.empty((n_platforms + 1, 4), np.int32)
+    platforms[0] = (0, height - 40, width, 0)
+    platforms[1:, 2] = rng.integers(50, 200, n_platforms)
+    platforms[1:, 0] = rng.integers(0, width - 50, n_platforms)
+    platforms[1:, 1] = rng.integers(80, height - 80, n_platforms)
+    platforms[1:, 3] = rng.random(n_platforms) < 0.2
+    coins = np.stack([rng.integers(0, width - 20, n_coins),
+                      rng.integers(20, height - 60, n_coins)], axis=1).astype(np.int32)
+    doors = np.array([(width - 100, height - 100, 1, n_coins + 1)], np.int32)
+    enemies = np.empty((n_enemies, 5), np.int32)
+    enemies[:, 2] = rng.integers(0, width - 160, n_enemies)
+    enemies[:, 3] = enemies[:, 2] + rng.integers(60, 160, n_enemies)
+    enemies[:, 0] = enemies[:, 2] + 1
+    enemies[:, 1] = rng.integers(40, height - 70, n_enemies)
+    enemies[:, 4] = rng.integers(0, len(ENEMY_TYPES), n_enemies)
+    speeds = 1 + rng.integers(1, 5, n_enemies) * 0.5
+    return CompiledLevel(number, platforms, coins.reshape(-1, 2), doors, enemies, speeds)
+
+# Chemins du fichier JSON et du fichier compilé d'un niveau
+def level_paths(number, level_dir=LEVEL_DIR):
+    base = os.path.join(level_dir, f"level{number}")
+    return base + ".json", base + ".lvl"
+
+# Lecture d'un niveau : fichier compilé s'il est à jour, sinon compilation du JSON
+# (et écriture du fichier compilé pour les prochains lancements)
+def read_level(number, level_dir=LEVEL_DIR):
+    json_path, compiled_path = level_paths(number, level_dir)
+    if not os.path.exists(json_path):
+        if os.path.exists(compiled_path):
+            with open(compiled_path, "rb") as f:
+                return CompiledLevel.from_bytes(f.read())
+        return empty_level(number)
+    if (os.path.exists(compiled_path) and
+            os.path.getmtime(compiled_path) >= os.path.getmtime(json_path)):
+        with open(compiled_path, "rb") as f:
+            return CompiledLevel.from_bytes(f.read())
+    with open(json_path, encoding="utf-8") as f:
+        level = compile_level(json.load(f))
+    data = level.to_bytes()
+    try:
+        with open(compiled_path, "wb") as f:
+            f.write(data)
+    except OSError:
+        pass  # Dossier en lecture seule : le niveau reste compilé en mémoire
+    return CompiledLevel.from_bytes(data)
+
+# Cache mémoire des niveaux compilés
+class LevelCache:
+    def __init__(self, level_dir=LEVEL_DIR):
+        self.level_dir = level_dir
+        self.levels = {}  # Numéro -> CompiledLevel
+
+    def get(self, number):
+        level = self.levels.get(number)
+        if level is None:
+            level = self.levels[number] = read_level(number, self.level_dir)
+        return level
+
+    def put(self, level):
+        # Ajout d'un niveau construit en mémoire (niveaux générés, tests de charge)
+        self.levels[level.number] = level
+
+    def clear(self):
+        self.levels.clear()
+
+# Cache partagé par défaut
+level_cache = LevelCache()
+
+# Compilation de tous les niveaux du dossier : python levels.py
+if __name__ == "__main__":
+    level_dir = sys.argv[1] if len(sys.argv) > 1 else LEVEL_DIR
+    for name in sorted(os.listdir(level_dir)):
+        if name.startswith("level") and name.endswith(".json"):
+            number = int(name[len("level"):-len(".json")])
+            level = read_level(number, level_dir)
+            print(f"Niveau {number}: {len(level.platforms)} plateformes, {len(level.coins)} pièces, "
+                  f"{len(level.doors)} portes, {len(level.enemies)} ennemis")
@@ -0,0 +1,64 @@
+# Journal de débogage en mémoire : les messages sont ajoutés à un tampon circulaire
+# (sans écriture sur la sortie standard pendant la frame) et vidés par un thread en
+# arrière-plan. Une sortie lente (tube, collecteur de logs) ne bloque que ce thread.
+import sys
+import threading
+import time
+from collections import deque
+
+# Nombre de messages gardés en attente d'écriture
+CAPACITY = 1024
+# Intervalle entre deux vidages du tampon (secondes)
+FLUSH_INTERVAL = 0.5
+
+class LogBuffer:
+    def __init__(self, capacity=CAPACITY, stream=None):
+        self.messages = deque(maxlen=capacity)
+        self.stream = stream
+        self.dropped = 0      # Messages perdus parce que le tampon était plein
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()  # Un seul vidage à la fois
+
+    def write(self, message):
+        # Appelable depuis la boucle de jeu : un simple ajout au tampon
+        if len(self.messages) == self.messages.maxlen:
+            self.dropped += 1
+        self.messages.append(f"[{time.strftime('%H:%M:%S')}] {message}")
+
+    def flush(self):
+        # Écrit les messages en attente sur la sortie
+        with self.lock:
+            stream = self.stream or sys.stdout
+            lines = []
+            while self.messages:
+                lines.append(self.messages.popleft())
+            if self.dropped:
+                lines.append(f"({self.dropped} messages perdus)")
+                self.dropped = 0
+            if lines:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+
+    def start(self, interval=FLUSH_INTERVAL):
+        # Vidage périodique dans un thread en arrière-plan
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, args=(interval,), daemon=True)
+        self.thread.start()
+
+    def run(self, interval):
+        while not self.stop_event.wait(interval):
+            self.flush()
+
+    def stop(self):
+        # Arrêt du thread et dernier vidage (à la fermeture du jeu)
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+# Journal partagé par défaut
+log = LogBuffer()
@@ -0,0 +1,120 @@
+# Système de particules purement visuel, en structure de tableaux NumPy.
+# Les particules vivantes occupent les `count` premières cases de tableaux préalloués :
+# émission, intégration et suppression des particules mortes se font par opérations
+# vectorisées, sans objet Python par particule. Le rendu (voir Renderer.draw_particles)
+# blitte des sprites pré-rendus choisis par type et par niveau de fondu.
+#
+# Les émetteurs sont alimentés une fois par tick par les effets de la simulation
+# (state.effects : pièce ramassée, ennemi écrasé ou touché, débris) et par les boules
+# de feu en vol. Les particules n'influent jamais sur la partie.
+import numpy as np
+
+# Nombre maximal de particules simultanées
+PARTICLE_CAPACITY = 16384
+# Niveaux de fondu pré-rendus par type (le dernier est le plus petit)
+FADE_STEPS = 4
+
+# Types de particules : couleur, rayon (px), nombre par émission, vitesse (px/s),
+# direction moyenne et dispersion (radians, 0 vers la droite, -π/2 vers le haut),
+# durée de vie (s) et gravité (px/s²)
+PARTICLE_TYPES = {
+    "trail": {"color": (255, 160, 0), "radius": 3, "count": 2, "speed": (10, 40),
+              "angle": -np.pi / 2, "spread": np.pi, "life": (0.15, 0.3), "gravity": -60},
+    "coin": {"color": (255, 215, 0), "radius": 3, "count": 16, "speed": (60, 180),
+             "angle": -np.pi / 2, "spread": 2 * np.pi, "life": (0.4, 0.6), "gravity": 300},
+    "stomp": {"color": (200, 190, 170), "radius": 4, "count": 12, "speed": (40, 120),
+              "angle": -np.pi / 2, "spread": np.pi, "life": (0.25, 0.4), "gravity": 200},
+    "kill": {"color": (255, 80, 0), "radius": 3, "count": 24, "speed": (80, 240),
+             "angle": -np.pi / 2, "spread": 2 * np.pi, "life": (0.4, 0.7), "gravity": 400},
+    "debris": {"color": (139, 69, 19), "radius": 4, "count": 20, "speed": (100, 250),
+               "angle": -np.pi / 2, "spread": np.pi / 1.5, "life": (0.8, 1.2), "gravity": 900},
+}
+PARTICLE_KINDS = list(PARTICLE_TYPES)  # Code du type -> nom
+
+class ParticleSystem:
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)              # Vitesse (px/s)
+        self.vy = np.zeros(capacity)
+        self.gravity = np.zeros(capacity)         # Accélération verticale (px/s²)
+        self.life = np.zeros(capacity)            # Durée de vie restante (s)
+        self.max_life = np.ones(capacity)         # Durée de vie initiale (s)
+        self.kind = np.zeros(capacity, np.int16)  # Code du type (indice dans PARTICLE_KINDS)
+        self.count = 0                            # Nombre de particules vivantes
+        self.dropped = 0                          # Particules non émises faute de place
+        self.rng = np.random.default_rng(seed)    # Aléatoire propre, distinct de celui de la partie
+        self.world = None                         # Monde des particules (vidées au changement)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, kind, x, y, count=None):
+        # Émission de `count` particules de type `kind` autour de chaque origine (x, y) ;
+        # x et y peuvent être des nombres ou des tableaux d'origines
+        spec = PARTICLE_TYPES[kind]
+        count = spec["count"] if count is None else count
+        x = np.repeat(np.atleast_1d(x), count)
+        y = np.repeat(np.atleast_1d(y), count)
+        n = min(len(x), self.capacity - self.count)
+        self.dropped += len(x) - n
+        if n <= 0:
+            return
+        rng = self.rng
+        angle = spec["angle"] + (rng.random(n) - 0.5) * spec["spread"]
+        speed = rng.uniform(*spec["speed"], n)
+        life = rng.uniform(*spec["life"], n)
+        start, stop = self.count, self.count + n
+        self.x[start:stop] = x[:n]
+        self.y[start:stop] = y[:n]
+        self.vx[start:stop] = np.cos(angle) * speed
+        self.vy[start:stop] = np.sin(angle) * speed
+        self.gravity[start:stop] = spec["gravity"]
+        self.life[start:stop] = life
+        self.max_life[start:stop] = life
+        self.kind[start:stop] = PARTICLE_KINDS.index(kind)
+        self.count = stop
+
+    def emit_effects(self, state):
+        # Émetteurs d'un tick de simulation : effets de state.effects et traînées des
+        # boules de feu
+        if state.world is not self.world:
+            self.world = state.world  # Nouveau niveau : les anciennes particules disparaissent
+            self.clear()
+        for kind, x, y in state.effects:
+            self.emit(kind, x, y)
+        fireballs = state.player.fireballs
+        n = fireballs.count
+        if n:
+            self.emit("trail", fireballs.x[:n], fireballs.y[:n])
+
+    def update(self, dt):
+        # Intégration de toutes les particules sur `dt` secondes, puis suppression des
+        # particules mortes par compactage des tableaux
+        n = self.count
+        if not n:
+            return
+        vy = self.vy[:n]
+        vy += self.gravity[:n] * dt
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += vy * dt
+        life = self.life[:n]
+        life -= dt
+        alive = life > 0
+        kept = int(np.count_nonzero(alive))
+        if kept == n:
+            return
+        for array in (self.x, self.y, self.vx, self.vy, self.gravity, self.life, self.max_life, self.kind):
+            array[:kept] = array[:n][alive]
+        self.count = kept
+
+    def sprites(self):
+        # Indice du sprite de chaque particule vivante : type * FADE_STEPS + niveau de fondu
+        n = self.count
+        fade = ((1.0 - self.life[:n] / self.max_life[:n]) * FADE_STEPS).astype(np.int16)
+        np.minimum(fade, FADE_STEPS - 1, out=fade)
+        return self.kind[:n] * FADE_STEPS + fade
@@ -0,0 +1,91 @@
+# Préparation des niveaux suivants en arrière-plan.
+# Passer une porte chargeait le niveau suivant pendant la frame même : lecture du
+# fichier, création des entités, index spatiaux, chunks, puis calques des plateformes à
+# la première image. Sur un grand niveau, cette frame se voyait.
+# Le préchargeur fait ce travail en avance, en trois temps :
+# - au chargement d'un niveau, les niveaux de ses portes sont lus et compilés dans un
+#   thread ;
+# - quand Mario approche d'une porte qu'il peut franchir, le niveau suivant est construit
+#   dans ce thread (PreparedLevel : objets Python et tableaux NumPy seulement) ;
+# - une fois ce niveau prêt, les calques de ses premiers chunks sont dessinés sur le
+#   thread principal, un par frame (bake) : pygame et les caches du rendu ne sont jamais
+#   touchés par le thread.
+# Au passage de la porte, GameState.load() prend le niveau prêt : il ne reste qu'à tirer
+# les types des ennemis et à activer les chunks autour de la caméra, sur le thread
+# principal. Un niveau préparé sert une seule fois ; la partie est la même, avec ou sans
+# préchargeur.
+#
+# Ce module n'importe pas pygame : le rendu passe par la fonction `bake`.
+from concurrent.futures import ThreadPoolExecutor
+
+from levels import level_cache
+from simulation import PreparedLevel
+
+# Distance horizontale (pixels) entre Mario et une porte franchissable à partir de
+# laquelle le niveau suivant est construit
+PREFETCH_DISTANCE = 600
+
+class LevelPrefetcher:
+    def __init__(self, cache=level_cache, bake=None, distance=PREFETCH_DISTANCE):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self.cache = cache
+        # Préparation du rendu d'un monde prêt : bake(world), appelé une fois par frame sur
+        # le thread principal jusqu'à ce qu'il renvoie True
+        self.bake = bake
+        self.distance = distance
+        self.reading = {}           # Numéro -> future de la lecture du niveau compilé
+        self.building = {}          # Numéro -> future du niveau préparé
+        self.baked = set()          # Niveaux préparés dont le rendu est prêt
+        self.world = None           # Monde du niveau en cours
+        self.hits = 0               # Chargements servis par un niveau préparé
+        self.misses = 0             # Chargements construits sur le thread principal
+
+    def read(self, number):
+        if number not in self.reading:
+            self.reading[number] = self.executor.submit(self.cache.get, number)
+
+    def build(self, number):
+        if number not in self.building:
+            self.read(number)
+            self.building[number] = self.executor.submit(PreparedLevel, number, self.cache)
+
+    def update(self, state):
+        # Appelé une fois par frame, sur le thread principal : lecture des niveaux des
+        # portes au chargement d'un niveau, construction de celui d'une porte franchissable
+        # toute proche, puis rendu d'un niveau prêt
+        doors = state.doors
+        if state.world is not self.world:
+            self.world = state.world
+            targets = {door.next_level for door in doors}
+            # Les niveaux préparés pour d'autres portes ne serviront plus
+            for number in [number for number in self.building if number not in targets]:
+                self.building.pop(number).cancel()
+                self.baked.discard(number)
+            for number in targets:
+                self.read(number)
+        player = state.player
+        for door in doors:
+            if player.coins_collected >= door.coins_required and abs(door.x - player.x) < self.distance:
+                self.build(door.next_level)
+        if self.bake is not None:
+            # Rendu d'un seul niveau prêt par frame
+            for number, future in self.building.items():
+                if number not in self.baked and future.done() and future.exception() is None:
+                    if self.bake(future.result().world):
+                        self.baked.add(number)
+                    break
+
+    def take(self, number):
+        # Niveau préparé (attendu s'il est en cours de construction), ou None. Une lecture
+        # en cours est attendue aussi : le niveau ne sera pas compilé deux fois.
+        reading = self.reading.pop(number, None)
+        if reading is not None:
+            reading.result()
+        future = self.building.pop(number, None)
+        self.baked.discard(number)
+        if future is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return future.result()
+
@@ -0,0 +1,96 @@
+# Profileur de frames intégré : mesure la durée de chaque phase de la boucle principale
+# (lecture des événements, mises à jour, passes de dessin, HUD, affichage), garde un
+# historique glissant pour l'affichage à l'écran et exporte des traces au format
+# « trace event » de Chrome (chrome://tracing, Perfetto).
+#
+# Utilisation autour d'une phase :
+#     start = profiler.begin()
+#     ...
+#     profiler.end("draw.hud", start)
+# L'affichage (enabled, F3) et la capture de trace (start_trace, F4) sont indépendants :
+# les mesures ont lieu dès que l'un des deux est actif. Sinon, begin() renvoie 0 et
+# end() sort immédiatement : le coût se limite à deux appels de méthode par phase.
+import json
+import time
+from collections import deque
+
+# Nombre de frames gardées pour les moyennes et centiles
+HISTORY = 120
+# Fréquence de recalcul des statistiques affichées (en frames)
+STATS_INTERVAL = 15
+# Nombre maximal d'événements gardés dans une trace
+MAX_TRACE_EVENTS = 1_000_000
+
+class FrameProfiler:
+    def __init__(self, history=HISTORY):
+        self.enabled = False       # Affichage des statistiques à l'écran
+        self.history = history
+        self.samples = {}          # Phase -> deque des durées par frame (ms)
+        self.frame = {}            # Phase -> durée cumulée dans la frame en cours (ns)
+        self.stats = []            # [(phase, moyenne, p50, p95, p99)] pour l'affichage
+        self.frames = 0
+        self.trace_events = None   # Liste d'événements pendant une capture de trace
+        self.origin = time.perf_counter_ns()
+
+    def begin(self):
+        return time.perf_counter_ns() if self.enabled or self.trace_events is not None else 0
+
+    def end(self, name, start):
+        if not start or not (self.enabled or self.trace_events is not None):
+            return
+        now = time.perf_counter_ns()
+        self.frame[name] = self.frame.get(name, 0) + now - start
+        if self.trace_events is not None and len(self.trace_events) < MAX_TRACE_EVENTS:
+            self.trace_events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                                      "ts": (start - self.origin) / 1000,
+                                      "dur": (now - start) / 1000})
+
+    def end_frame(self):
+        # Clôture de la frame : les durées cumulées rejoignent l'historique (affiché)
+        if not self.enabled:
+            self.frame.clear()  # Mesures faites pour la seule trace
+            return
+        for name, duration in self.frame.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.history)
+            samples.append(duration / 1e6)
+        self.frame.clear()
+        self.frames += 1
+        if self.frames % STATS_INTERVAL == 0:
+            self.stats = self.compute_stats()
+
+    def compute_stats(self):
+        stats = []
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            last = len(ordered) - 1
+            stats.append((name, sum(ordered) / len(ordered), ordered[last // 2],
+                          ordered[int(last * 0.95)], ordered[int(last * 0.99)]))
+        return stats
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame.clear()
+        if not self.enabled:
+            self.samples.clear()
+            self.stats = []
+
+    # Capture de trace au format Chrome
+    @property
+    def tracing(self):
+        return self.trace_events is not None
+
+    def start_trace(self):
+        self.trace_events = []
+
+    def stop_trace(self, path):
+        # Écrit la trace capturée dans `path` et renvoie le nombre d'événements
+        events = self.trace_events or []
+        self.trace_events = None
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+# Profileur désactivé utilisé par défaut (ne jamais l'activer)
+NULL_PROFILER = FrameProfiler()
@@ -0,0 +1,112 @@
+# Système de projectiles (boules de feu) en pool de capacité fixe.
+# Les projectiles vivants occupent les `count` premières cases de tableaux préalloués ;
+# une suppression déplace le dernier projectile dans la case libérée (swap-remove),
+# sans allocation ni décalage de liste.
+import numpy as np
+
+# Nombre maximal de boules de feu simultanées
+FIREBALL_CAPACITY = 256
+# Taille de la boîte de collision d'une boule de feu
+FIREBALL_SIZE = 10
+
+class ProjectilePool:
+    __slots__ = ("capacity", "x", "y", "speed", "prev_x", "count")
+
+    def __init__(self, capacity=FIREBALL_CAPACITY):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)      # Position horizontale
+        self.y = np.zeros(capacity)      # Position verticale
+        self.speed = np.zeros(capacity)  # Vitesse horizontale (signe = direction)
+        self.prev_x = np.zeros(capacity) # Position horizontale au tick précédent (rendu)
+        self.count = 0                   # Nombre de projectiles vivants
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, x, y, speed):
+        # Ajout d'un projectile, renvoie False si le pool est plein
+        if self.count >= self.capacity:
+            return False
+        i = self.count
+        self.x[i] = x
+        self.prev_x[i] = x  # Lancée pendant ce tick : pas de mouvement à interpoler
+        self.y[i] = y
+        self.speed[i] = speed
+        self.count += 1
+        return True
+
+    def remove(self, i):
+        # Suppression par échange avec le dernier projectile vivant
+        last = self.count - 1
+        if i != last:
+            self.x[i] = self.x[last]
+            self.y[i] = self.y[last]
+            self.speed[i] = self.speed[last]
+            self.prev_x[i] = self.prev_x[last]
+        self.count = last
+
+    def update(self, enemies, left, right, hits=None):
+        # Avance tous les projectiles, retire ceux sortis de [left, right] et ceux qui
+        # touchent un ennemi. Renvoie le nombre d'ennemis touchés ; la position de chaque
+        # impact est ajoutée à la liste `hits` si elle est donnée.
+        n = self.count
+        if not n:
+            return 0
+        self.prev_x[:n] = self.x[:n]
+        self.x[:n] += self.speed[:n]
+        kills = 0
+        i = 0
+        while i < self.count:
+            x = self.x[i]
+            # Suppression des boules de feu sorties de l'écran
+            if x > right or x < left:
+                self.remove(i)
+                continue
+            # Collision des boules de feu avec les ennemis des colonnes voisines
+            touched = enemies.overlapping(x, self.y[i], FIREBALL_SIZE, FIREBALL_SIZE)
+            if touched:
+                enemies.kill(touched[0])
+                if hits is not None:
+                    hits.append((x, self.y[i]))
+                self.remove(i)
+                kills += 1
+                continue
+            i += 1
+        return kills
+
+    def hit_platforms(self, index):
+        # Retire les projectiles qui touchent une plateforme cassable (les autres
+        # plateformes ne les arrêtent pas) et renvoie ces plateformes, chacune une fois.
+        # Toutes les boules de feu qui touchent une même plateforme pendant le tick
+        # disparaissent, même si elle n'est cassée qu'une fois.
+        broken = {}
+        i = 0
+        while i < self.count:
+            x = self.x[i]
+            y = self.y[i]
+            hit = False
+            for platform in index.query(x, y, FIREBALL_SIZE, FIREBALL_SIZE):
+                if (platform.is_breakable and
+                        x + FIREBALL_SIZE > platform.x and x < platform.x + platform.width and
+                        y + FIREBALL_SIZE > platform.y and y < platform.y + platform.height):
+                    broken[platform] = None
+                    hit = True
+            if hit:
+                self.remove(i)
+                continue
+            i += 1
+        return list(broken)
+
+    def positions(self, alpha=1.0):
+        # (x, y) de chaque projectile vivant, pour le rendu. Avec alpha < 1, la position
+        # est interpolée entre le tick précédent et le tick courant (une boule de feu
+        # lancée pendant le tick reste à son point de départ).
+        n = self.count
+        x = self.x[:n]
+        if alpha < 1.0:
+            prev_x = self.prev_x[:n]
+            x = prev_x + (x - prev_x) * alpha
+        return zip(x.tolist(), self.y[:n].tolist())
@@ -0,0 +1,664 @@
+# Rendu pygame d'un GameState sur une surface.
+# Toute la logique du jeu se trouve dans simulation.py ; ce module ne fait que dessiner.
+import random
+import weakref
+
+import numpy as np
+import pygame
+
+from colors import (SKY_BLUE, WHITE, BLACK, RED, YELLOW, GREEN, DARK_GREEN, BROWN,
+                    DARK_BROWN, GRAY)
+from particles import ParticleSystem
+from profiler import NULL_PROFILER
+from simulation import WIDTH, HEIGHT
+from sprites import SpriteCache, new_keyed_surface, new_sprite_surface
+from world import Camera, platform_bounds
+
+# Nuages de l'écran de jeu : (x, y, couche)
+GAME_CLOUDS = [(100, 100, 1), (400, 150, 2), (700, 80, 1), (200, 50, 3), (600, 120, 2)]
+
+# Période de défilement des nuages : ils sortent à gauche et reviennent par la droite
+CLOUD_PERIOD = WIDTH + 200
+
+# Déplacement au-delà duquel une entité est considérée comme téléportée
+TELEPORT_DISTANCE = 100
+
+# Collines du menu : période de défilement et nombre de couches
+MENU_HILL_PERIOD = WIDTH + 400
+MENU_HILL_LAYERS = 3
+
+# Cadre du HUD
+HUD_RECT = pygame.Rect(10, 10, 200, 120)
+
+# Marge hors écran au-delà de laquelle les particules ne sont pas dessinées
+PARTICLE_MARGIN = 16
+
+# Surface modifiée au-delà de laquelle le rendu par zones redessine tout l'écran
+FULL_REDRAW_AREA = WIDTH * HEIGHT // 2
+
+# Voile sombre des écrans de fin
+OVERLAY_COLOR = (0, 0, 0, 180)
+
+# Dessin d'un nuage de trois cercles
+def draw_cloud(surface, cloud_x, y, size):
+    pygame.draw.circle(surface, WHITE, (cloud_x, y), size)
+    pygame.draw.circle(surface, WHITE, (cloud_x + size//2, y - size//3), size//1.5)
+    pygame.draw.circle(surface, WHITE, (cloud_x + size, y), size)
+
+# Fusion des rectangles qui se chevauchent, limités à `bounds`
+def merge_rects(rects, bounds):
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+# Dessin d'une plateforme avec effet 3D
+def draw_platform(surface, platform, dx=0, dy=0):
+    # (dx, dy) : position de la surface dans le monde (calque d'un chunk, sprite)
+    x, y, width, height, depth = platform.x - dx, platform.y - dy, platform.width, platform.height, platform.depth
+    color = BROWN if platform.is_breakable else GREEN
+    dark_color = DARK_BROWN if platform.is_breakable else DARK_GREEN
+    pygame.draw.rect(surface, color, (x, y, width, height), border_radius=5)
+    front = [(x, y + height),
+             (x + depth, y + height - depth),
+             (x + width + depth, y + height - depth),
+             (x + width, y + height)]
+    pygame.draw.polygon(surface, dark_color, front)
+    side = [(x + width, y),
+            (x + width + depth, y - depth),
+            (x + width + depth, y + height - depth),
+            (x + width, y + height)]
+    pygame.draw.polygon(surface, dark_color, side)
+    # Détails sur la plateforme
+    for i in range(0, width, 10):
+        pygame.draw.line(surface, dark_color, (x + i, y), (x + i, y + height), 2)
+    for i in range(0, height, 10):
+        pygame.draw.line(surface, dark_color, (x, y + i), (x + width, y + i), 2)
+
+# Calques statiques du niveau : les plateformes de chaque chunk du monde dessinées une
+# seule fois dans une surface de la largeur du chunk. Seuls les chunks visibles sont
+# dessinés, et les calques des chunks suspendus sont libérés. Quand une plateforme est
+# détruite, seule la zone qu'elle occupait est effacée et redessinée dans le calque.
+# Les plateformes sont pré-rendues une fois par forme : un calque se (re)compose d'un
+# seul appel à blits().
+class LevelLayer:
+    def __init__(self):
+        self.world = None    # Monde actuellement dessiné
+        self.surfaces = {}   # Indice du chunk -> calque de ses plateformes
+        self.applied = {}    # Indice du chunk -> nombre de zones de chunk.damaged déjà traitées
+        self.repaired = []   # Zones redessinées au dernier update : (abscisse du chunk, Rect du calque)
+        self.sprites = {}    # (largeur, hauteur, relief, cassable) -> (surface, dx, dy)
+        # Calques dessinés à l'avance pour des mondes pas encore affichés (voir prebuild)
+        self.prebuilt = weakref.WeakKeyDictionary()
+        self.ready = {}      # Calques préparés du monde dessiné, pas encore utilisés
+
+    def sprite(self, platform):
+        # Dessin d'une plateforme : il ne dépend que de sa forme et de son type
+        key = (platform.width, platform.height, platform.depth, platform.is_breakable)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            x, y, width, height = platform_bounds(platform)
+            surface = new_keyed_surface(width, height)
+            draw_platform(surface, platform, x, y)
+            sprite = self.sprites[key] = (surface, x - platform.x, y - platform.y)
+        return sprite
+
+    def blits(self, platforms, chunk_x):
+        # Plateformes à copier dans le calque d'un chunk : [(surface, position)]
+        items = []
+        for platform in platforms:
+            surface, dx, dy = self.sprite(platform)
+            items.append((surface, (platform.x - chunk_x + dx, platform.y + dy)))
+        return items
+
+    def render(self, chunk):
+        surface = new_sprite_surface(chunk.width, HEIGHT)
+        surface.blits(self.blits(chunk.platforms, chunk.x), doreturn=False)
+        return surface
+
+    def build(self, chunk):
+        self.applied[chunk.index] = len(chunk.damaged)
+        return self.render(chunk)
+
+    def prebuild(self, world, count=1):
+        # Calques des chunks visibles au départ d'un monde qui n'est pas encore dessiné
+        # (Mario apparaît à gauche, caméra au bord du monde), `count` à la fois. Appelé
+        # une fois par frame par le préchargeur (voir prefetch.py), sur le thread principal
+        # comme tout le dessin. Renvoie True quand tous les calques sont prêts.
+        surfaces = self.prebuilt.get(world)
+        if surfaces is None:
+            surfaces = self.prebuilt[world] = {}
+        for chunk in world.visible(Camera(world.width, WIDTH)):
+            if chunk.index not in surfaces:
+                if count <= 0:
+                    return False
+                surfaces[chunk.index] = self.render(chunk)
+                count -= 1
+        return True
+
+    def repair(self, surface, chunk):
+        # Zones des plateformes détruites depuis le dernier passage, fusionnées : effacées
+        # puis redessinées avec les plateformes restantes qui les touchent, dans leur
+        # ordre. Au-delà de la moitié du calque, il est redessiné en entier.
+        area = surface.get_rect()
+        rects = merge_rects([pygame.Rect(x - chunk.x, y, width, height)
+                             for x, y, width, height in chunk.damaged[self.applied[chunk.index]:]], area)
+        if sum(rect.width * rect.height for rect in rects) > area.width * area.height // 2:
+            self.repaired.append((chunk.x, area))
+            return self.build(chunk)
+        bounds = [pygame.Rect(platform_bounds(platform)).move(-chunk.x, 0) for platform in chunk.platforms]
+        for rect in rects:
+            surface.set_clip(rect)
+            surface.fill((0, 0, 0, 0), rect)
+            platforms = chunk.platforms
+            surface.blits(self.blits([platforms[i] for i in rect.collidelistall(bounds)], chunk.x),
+                          doreturn=False)
+            self.repaired.append((chunk.x, rect))
+        surface.set_clip(None)
+        self.applied[chunk.index] = len(chunk.damaged)
+        return surface
+
+    def update(self, world, camera):
+        # Calques des chunks visibles : [(surface, abscisse dans le monde)]
+        if world is not self.world:
+            self.surfaces.clear()
+            self.applied.clear()
+            self.ready = self.prebuilt.pop(world, {})
+            self.world = world
+        elif len(self.surfaces) > len(world.active):
+            for index in [index for index in self.surfaces if not world.chunks[index].active]:
+                del self.surfaces[index]
+        layers = []
+        self.repaired = []
+        for chunk in world.visible(camera):
+            surface = self.surfaces.get(chunk.index)
+            if surface is None:
+                surface = self.ready.pop(chunk.index, None)
+                if surface is None:
+                    surface = self.build(chunk)
+                else:
+                    self.applied[chunk.index] = 0  # Préparé avant toute destruction
+                self.surfaces[chunk.index] = surface
+            if len(chunk.damaged) > self.applied[chunk.index]:
+                surface = self.surfaces[chunk.index] = self.repair(surface, chunk)
+            layers.append((surface, chunk.x))
+        return layers
+
+# Bande horizontale pré-rendue qui défile en boucle : la période est dessinée une seule
+# fois, puis recopiée par un ou deux blits selon le décalage.
+class ScrollingStrip:
+    def __init__(self, surface, x=0, y=0):
+        self.surface = surface
+        self.period = surface.get_width()
+        self.x = x  # Position de la bande pour un décalage nul (entre -période et 0)
+        self.y = y
+        self.rect = pygame.Rect(0, y, WIDTH, surface.get_height())  # Zone couverte à l'écran
+
+    def position(self, offset):
+        # Décalage effectif en pixels : la bande ne change qu'avec lui
+        return int(offset) % self.period
+
+    def draw(self, screen, offset):
+        x = self.x - self.position(offset)
+        while x < WIDTH:
+            screen.blit(self.surface, (x, self.y))
+            x += self.period
+
+# Collines du menu, une bande par couche
+def bake_menu_hills():
+    strips = []
+    for layer in range(MENU_HILL_LAYERS):
+        size = 100 + layer * 50
+        surface = new_sprite_surface(MENU_HILL_PERIOD, size // 2)
+        for i in range(3):
+            pygame.draw.ellipse(surface, (0, 150 - layer * 30, 0), (i * 400, 0, size, size // 2))
+        strips.append(ScrollingStrip(surface, -200, HEIGHT - 100 + layer * 50))
+    return strips
+
+# Fond de nuages en parallaxe : les nuages d'une même couche défilent à la même vitesse
+# et sont dessinés une fois dans une bande bouclée ; chaque frame ne coûte qu'un ou deux
+# blits par couche, quel que soit le nombre de nuages.
+class ParallaxClouds:
+    def __init__(self, clouds, period=CLOUD_PERIOD):
+        layers = {}
+        for x, y, layer in clouds:
+            layers.setdefault(layer, []).append((x, y))
+        # Les couches les plus lentes (les plus lointaines) sont dessinées en premier
+        self.layers = [(100 * layer, self.bake(layers[layer], 30 + layer * 10, period))
+                       for layer in sorted(layers, reverse=True)]
+
+    def bake(self, clouds, size, period):
+        top = min(y for x, y in clouds) - size
+        bottom = max(y for x, y in clouds) + size
+        surface = new_sprite_surface(period, bottom - top + 1)
+        for x, y in clouds:
+            # Un nuage à cheval sur le bord de la bande est aussi dessiné de l'autre côté
+            for shift in (-period, 0, period):
+                draw_cloud(surface, x % period + shift, y - top, size)
+        return ScrollingStrip(surface, -100, top)
+
+    def positions(self, time_ms):
+        # Décalage de chaque couche (pour savoir lesquelles ont bougé)
+        return [strip.position(time_ms / divisor) for divisor, strip in self.layers]
+
+    def draw(self, screen, time_ms):
+        for divisor, strip in self.layers:
+            strip.draw(screen, time_ms / divisor)
+
+# Rendu d'une partie
+class Renderer:
+    def __init__(self, screen, title_font, hud_font, small_font, text_cache, rng=random):
+        self.screen = screen
+        self.text_cache = text_cache  # Cache des textes partagé avec le menu
+        self.title_font = title_font
+        self.hud_font = hud_font
+        self.small_font = small_font
+        self.sprites = SpriteCache(hud_font, text_cache)  # Sprites pré-rendus des entités
+        self.level_layer = LevelLayer()       # Plateformes pré-rendues du niveau
+        self.profiler = NULL_PROFILER         # Mesure des passes de dessin (voir profiler.py)
+        self.overlay = None                   # Écran de fin composé : ((état, score), surface)
+        self.clouds = ParallaxClouds(GAME_CLOUDS)  # Nuages pré-rendus en bandes défilantes
+        self.camera_x = 0                     # Abscisse de la caméra pour la frame en cours
+        self.particles = ParticleSystem()     # Particules des effets (voir particles.py)
+        self.particle_sprites = None          # (surfaces, décalages) des sprites de particules
+
+        # Création des étoiles de fond
+        stars = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        for i in range(50):
+            x = rng.randint(0, WIDTH)
+            y = rng.randint(0, HEIGHT//2)
+            size = rng.randint(2, 5)
+            pygame.draw.circle(stars, (255, 255, 255, 150), (x, y), size)
+        # Ciel et étoiles fusionnés une fois pour toutes dans une surface opaque
+        self.sky = pygame.Surface((WIDTH, HEIGHT))
+        self.sky.fill(SKY_BLUE)  # Fond bleu ciel
+        self.sky.blit(stars, (0, 0))  # Étoiles de fond
+        if pygame.display.get_surface() is not None:
+            self.sky = self.sky.convert()
+
+    def blit(self, surface, position):
+        # Blit d'un élément de premier plan (textes du HUD, écran de fin)
+        self.screen.blit(surface, position)
+
+    def invalidate(self):
+        # Écran modifié par ailleurs (menu) : rien à faire, chaque frame est complète
+        pass
+
+    def present(self):
+        pygame.display.flip()
+
+    def draw_sprite(self, sprite, x, y):
+        # Blit d'un sprite pré-rendu à la position d'une entité (coordonnées du monde)
+        surface, dx, dy = sprite
+        self.screen.blit(surface, (int(x - self.camera_x) + dx, int(y) + dy))
+
+    def draw_player(self, player, x, y):
+        self.draw_sprite(self.sprites.player(player), x, y)
+
+    def draw_coin(self, coin):
+        self.draw_sprite(self.sprites.coin(coin), coin.x, coin.y)
+
+    def draw_door(self, door):
+        self.draw_sprite(self.sprites.door(door), door.x, door.y)
+
+    def draw_enemies(self, enemies, x=None):
+        for x, y, enemy_type, animation_frame in enemies.records(x):
+            self.draw_sprite(self.sprites.enemy(enemy_type, animation_frame), x, y)
+
+    def draw_fireballs(self, fireballs, alpha=1.0):
+        # Toutes les boules de feu en un seul appel à blits()
+        if not len(fireballs):
+            return
+        surface, dx, dy = self.sprites.fireball()
+        camera_x = self.camera_x
+        self.screen.blits([(surface, (int(x - camera_x) + dx, int(y) + dy))
+                           for x, y in fireballs.positions(alpha)], doreturn=False)
+
+    def visible_particles(self):
+        # Sprite et position à l'écran des particules visibles, calculés en bloc
+        particles = self.particles
+        if self.particle_sprites is None:
+            sprites = self.sprites.particles()
+            self.particle_sprites = ([surface for surface, dx, dy in sprites],
+                                     np.array([dx for surface, dx, dy in sprites]))
+        offsets = self.particle_sprites[1]
+        n = len(particles)
+        x = particles.x[:n] - self.camera_x
+        y = particles.y[:n]
+        visible = ((x > -PARTICLE_MARGIN) & (x < WIDTH + PARTICLE_MARGIN) &
+                   (y > -PARTICLE_MARGIN) & (y < HEIGHT + PARTICLE_MARGIN))
+        index = particles.sprites()[visible]
+        offset = offsets[index]
+        return index, (x[visible] + offset).astype(int), (y[visible] + offset).astype(int)
+
+    def particle_blits(self, index, x, y):
+        # Construction de la liste sans boucle Python (map et zip)
+        surfaces = self.particle_sprites[0]
+        return list(zip(map(surfaces.__getitem__, index.tolist()), zip(x.tolist(), y.tolist())))
+
+    def draw_particles(self):
+        if len(self.particles):
+            self.screen.blits(self.particle_blits(*self.visible_particles()), doreturn=False)
+
+    def draw_background(self):
+        self.screen.blit(self.sky, (0, 0))  # Ciel et étoiles
+
+        # Dessin des nuages
+        self.clouds.draw(self.screen, pygame.time.get_ticks())
+
+    def draw_world(self, state, alpha=1.0, previous=None):
+        # Dessin des éléments du jeu. Avec `previous` (positions avant le dernier tick),
+        # les entités mobiles sont interpolées à la fraction `alpha` du tick.
+        player = state.player
+        camera = state.camera
+        player_x, player_y = player.x, player.y
+        camera_x = camera.x
+        enemy_x = None
+        if previous is not None and previous.level == state.current_level:
+            # Pas d'interpolation sur un saut de position (vie perdue, nouveau niveau)
+            if (abs(player.x - previous.player_x) < TELEPORT_DISTANCE and
+                    abs(player.y - previous.player_y) < TELEPORT_DISTANCE):
+                player_x = previous.player_x + (player.x - previous.player_x) * alpha
+                player_y = previous.player_y + (player.y - previous.player_y) * alpha
+                camera_x = previous.camera_x + (camera.x - previous.camera_x) * alpha
+            # Pas d'interpolation des ennemis si certains ont disparu ou ont été
+            # suspendus pendant le tick
+            if previous.enemy_generation == state.enemies.generation:
+                enemy_x = previous.enemy_x + (state.enemies.x - previous.enemy_x) * alpha
+        else:
+            alpha = 1.0
+        self.camera_x = camera_x
+
+        profiler = self.profiler
+        start = profiler.begin()
+        self.draw_platforms(self.level_layer.update(state.world, camera))
+        profiler.end("draw.platforms", start)
+        start = profiler.begin()
+        for coin in state.world.coins():
+            self.draw_coin(coin)
+        profiler.end("draw.coins", start)
+        start = profiler.begin()
+        for door in state.world.doors():
+            self.draw_door(door)
+        profiler.end("draw.doors", start)
+        start = profiler.begin()
+        self.draw_enemies(state.enemies, enemy_x)
+        profiler.end("draw.enemies", start)
+        start = profiler.begin()
+        self.draw_fireballs(player.fireballs, alpha)
+        profiler.end("draw.fireballs", start)
+        start = profiler.begin()
+        self.draw_particles()
+        profiler.end("draw.particles", start)
+        start = profiler.begin()
+        self.draw_player(player, player_x, player_y)  # Dessin du joueur
+        profiler.end("draw.player", start)
+
+    def draw_platforms(self, layers):
+        camera_x = self.camera_x
+        for surface, x in layers:
+            self.screen.blit(surface, (int(x - camera_x), 0))
+
+    def draw_hud_panel(self):
+        pygame.draw.rect(self.screen, GRAY, HUD_RECT, border_radius=10)
+        pygame.draw.rect(self.screen, BLACK, HUD_RECT, 2, border_radius=10)
+
+    def draw_hud(self, state):
+        player = state.player
+        # HUD (Head-Up Display)
+        self.draw_hud_panel()
+        score_text = self.text_cache.render(self.hud_font, f"Score: {player.score}", WHITE)
+        level_text = self.text_cache.render(self.hud_font, f"Niveau: {state.current_level}", WHITE)
+        coins_text = self.text_cache.render(self.hud_font, f"Pièces: {player.coins_collected}", WHITE)
+        lives_text = self.text_cache.render(self.hud_font, f"Vies: {player.lives}", WHITE)
+        self.blit(score_text, (20, 20))
+        self.blit(level_text, (20, 50))
+        self.blit(coins_text, (20, 80))
+        self.blit(lives_text, (20, 110))
+        instructions = self.text_cache.render(self.small_font, "Flèches: Bouger - Espace: Sauter - F: Tirer - T: Tester Son - R: Réinitialiser - Échap: Menu", WHITE)
+        self.blit(instructions, (WIDTH//2 - instructions.get_width()//2, HEIGHT - 30))
+
+    def draw_overlay(self, state):
+        # Écrans de game over et de victoire, composés une fois (voile et textes) puis
+        # affichés d'un seul blit tant qu'ils ne changent pas
+        if state.status not in ("game_over", "victory"):
+            return
+        key = (state.status, state.player.score)
+        if self.overlay is None or self.overlay[0] != key:
+            self.overlay = (key, self.compose_overlay(*key))
+        self.blit(self.overlay[1], (0, 0))
+
+    def compose_overlay(self, status, score):
+        overlay = new_sprite_surface(WIDTH, HEIGHT)
+        overlay.fill(OVERLAY_COLOR)
+        # Écran de game over
+        if status == "game_over":
+            game_over_shadow = self.text_cache.render(self.title_font, "GAME OVER", BLACK)
+            game_over_text = self.text_cache.render(self.title_font, "GAME OVER", RED)
+            overlay.blit(game_over_shadow, (WIDTH//2 - game_over_shadow.get_width()//2 + 3, HEIGHT//2 - 50 + 3))
+            overlay.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, HEIGHT//2 - 50))
+            restart_text = self.text_cache.render(self.hud_font, "Appuyez sur ENTRÉE pour recommencer", WHITE)
+            overlay.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 20))
+
+        # Écran de victoire
+        if status == "victory":
+            victory_shadow = self.text_cache.render(self.title_font, "VICTOIRE!", BLACK)
+            victory_text = self.text_cache.render(self.title_font, "VICTOIRE!", YELLOW)
+            overlay.blit(victory_shadow, (WIDTH//2 - victory_shadow.get_width()//2 + 3, HEIGHT//2 - 80 + 3))
+            overlay.blit(victory_text, (WIDTH//2 - victory_text.get_width()//2, HEIGHT//2 - 80))
+            score_text = self.text_cache.render(self.hud_font, f"Score Final: {score}", WHITE)
+            overlay.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//2 + 10))
+            restart_text = self.text_cache.render(self.hud_font, "Appuyez sur ENTRÉE pour recommencer", WHITE)
+            overlay.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 50))
+        return overlay
+
+    def draw_profiler(self, profiler):
+        # Panneau des durées par phase : moyenne, médiane et centiles (ms).
+        # Renvoie la zone du panneau (ou None).
+        if not profiler.stats:
+            return None
+        font = self.small_font
+        line_height = font.get_linesize()
+        rows = [("phase", "moy", "p50", "p95", "p99")]
+        rows += [(name, *(f"{value:.2f}" for value in values)) for name, *values in profiler.stats]
+        columns = (0, 180, 245, 310, 375)
+        panel = pygame.Rect(WIDTH - 450, 10, 440, 10 + line_height * len(rows))
+        pygame.draw.rect(self.screen, GRAY, panel, border_radius=10)
+        pygame.draw.rect(self.screen, BLACK, panel, 2, border_radius=10)
+        for row_index, row in enumerate(rows):
+            y = panel.y + 5 + row_index * line_height
+            for column, text in zip(columns, row):
+                surface = self.text_cache.render(font, text, YELLOW if row_index == 0 else WHITE)
+                self.screen.blit(surface, (panel.x + 10 + column, y))
+        return panel
+
+    def draw(self, state, alpha=1.0, previous=None):
+        # Dessin complet d'une frame
+        profiler = self.profiler
+        start = profiler.begin()
+        self.draw_background()
+        profiler.end("draw.background", start)
+        self.draw_world(state, alpha, previous)
+        start = profiler.begin()
+        self.draw_hud(state)
+        profiler.end("draw.hud", start)
+        start = profiler.begin()
+        self.draw_overlay(state)
+        profiler.end("draw.overlay", start)
+        if profiler.enabled:
+            self.draw_profiler(profiler)
+
+# Rendu par rectangles modifiés (option --dirty-rects) : le fond (ciel, nuages,
+# plateformes) est composé dans une surface gardée en cache, et seules les zones des
+# éléments qui ont bougé ou changé d'apparence depuis la frame précédente sont
+# restaurées, redessinées puis envoyées à l'écran avec pygame.display.update(rects).
+# Un défilement de la caméra ou un changement de niveau redessine tout l'écran.
+class DirtyRectRenderer(Renderer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.background = pygame.Surface((WIDTH, HEIGHT))  # Fond composé
+        if pygame.display.get_surface() is not None:
+            self.background = self.background.convert()
+        self.background_key = None   # (monde, caméra) du fond composé
+        self.cloud_positions = None  # Décalage des couches de nuages dans le fond
+        self.layers = []             # Calques de plateformes de la frame
+        self.items = []              # Éléments de premier plan de la frame : (surface, position)
+        self.drawn = set()           # Éléments affichés à la frame précédente
+        self.particle_range = (0, 0) # Tranche des particules dans `items`
+        self.particle_rect = None    # Zone des particules de la frame, ou None
+        self.particle_drawn = None   # Zone des particules affichées à la frame précédente
+        self.panel = None            # Zone du panneau du profileur affiché
+        self.updated = None          # Zones à envoyer à l'écran (None : tout l'écran)
+        self.full = True             # Prochaine frame entièrement redessinée
+        # Cadre du HUD pré-rendu, traité comme un élément de premier plan (opaque, comme
+        # lorsqu'il est dessiné directement sur l'écran qui n'a pas de canal alpha)
+        self.hud_panel = new_sprite_surface(HUD_RECT.width, HUD_RECT.height)
+        pygame.draw.rect(self.hud_panel, GRAY[:3], self.hud_panel.get_rect(), border_radius=10)
+        pygame.draw.rect(self.hud_panel, BLACK, self.hud_panel.get_rect(), 2, border_radius=10)
+
+    def invalidate(self):
+        self.full = True
+
+    def present(self):
+        if self.updated is None:
+            pygame.display.flip()
+        elif self.updated:
+            pygame.display.update(self.updated)
+
+    # Les passes de dessin de Renderer enregistrent les éléments au lieu de les dessiner
+    def blit(self, surface, position):
+        self.items.append((surface, position))
+
+    def draw_sprite(self, sprite, x, y):
+        surface, dx, dy = sprite
+        self.items.append((surface, (int(x - self.camera_x) + dx, int(y) + dy)))
+
+    def draw_fireballs(self, fireballs, alpha=1.0):
+        if not len(fireballs):
+            return
+        surface, dx, dy = self.sprites.fireball()
+        camera_x = self.camera_x
+        self.items += [(surface, (int(x - camera_x) + dx, int(y) + dy))
+                       for x, y in fireballs.positions(alpha)]
+
+    def draw_platforms(self, layers):
+        self.layers = layers
+
+    def draw_particles(self):
+        # Les particules bougent à chaque frame : leur zone englobante est redessinée
+        # en bloc au lieu de les comparer une à une avec la frame précédente
+        start = len(self.items)
+        self.particle_rect = None
+        if len(self.particles):
+            index, x, y = self.visible_particles()
+            if len(index):
+                self.items += self.particle_blits(index, x, y)
+                size = max(surface.get_width() for surface in self.particle_sprites[0])
+                left, top = int(x.min()), int(y.min())
+                self.particle_rect = pygame.Rect(left, top, int(x.max()) - left + size,
+                                                 int(y.max()) - top + size)
+        self.particle_range = (start, len(self.items))
+
+    def draw_hud_panel(self):
+        self.items.append((self.hud_panel, HUD_RECT.topleft))
+
+    def compose(self, time_ms, rect=None):
+        # Composition du fond, limitée à `rect` si donné
+        background = self.background
+        background.set_clip(rect)
+        background.blit(self.sky, (0, 0))
+        self.clouds.draw(background, time_ms)
+        camera_x = self.camera_x
+        for surface, x in self.layers:
+            background.blit(surface, (int(x - camera_x), 0))
+        background.set_clip(None)
+
+    def dirty_rects(self, time_ms):
+        # Zones modifiées depuis la frame précédente, ou None s'il faut tout redessiner
+        dirty = []
+        # Couches de nuages qui ont défilé d'au moins un pixel
+        positions = self.clouds.positions(time_ms)
+        for (divisor, strip), old, new in zip(self.clouds.layers, self.cloud_positions, positions):
+            if old != new:
+                self.compose(time_ms, strip.rect)
+                dirty.append(strip.rect)
+        self.cloud_positions = positions
+        # Plateformes détruites, effacées des calques
+        camera_x = self.camera_x
+        for x, rect in self.level_layer.repaired:
+            rect = rect.move(int(x - camera_x), 0)
+            self.compose(time_ms, rect)
+            dirty.append(rect)
+        # Éléments apparus, déplacés ou changés, à leur nouvelle et à leur ancienne place
+        for surface, position in self.foreground().symmetric_difference(self.drawn):
+            dirty.append(pygame.Rect(position, surface.get_size()))
+        for rect in (self.particle_rect, self.particle_drawn, self.panel):
+            if rect is not None:
+                dirty.append(rect)
+
+        # Fusion des zones qui se chevauchent, limitées à l'écran
+        merged = merge_rects(dirty, self.screen.get_rect())
+        area = sum(rect.width * rect.height for rect in merged)
+        if area > FULL_REDRAW_AREA:
+            return None
+        return merged
+
+    def update_screen(self, world):
+        screen = self.screen
+        items = self.items
+        time_ms = pygame.time.get_ticks()
+        key = (world, self.camera_x)
+        dirty = None
+        if self.full or key != self.background_key:
+            # Nouveau fond : caméra déplacée, niveau changé ou écran à redessiner
+            self.background_key = key
+            self.cloud_positions = self.clouds.positions(time_ms)
+            self.compose(time_ms)
+        else:
+            dirty = self.dirty_rects(time_ms)
+
+        if dirty is None:
+            screen.blit(self.background, (0, 0))
+            screen.blits(items, doreturn=False)
+        else:
+            # Fond restauré dans chaque zone, puis éléments qui la touchent, dans l'ordre
+            rects = [pygame.Rect(position, surface.get_size()) for surface, position in items]
+            for rect in dirty:
+                screen.set_clip(rect)
+                screen.blit(self.background, rect, rect)
+                screen.blits([items[i] for i in rect.collidelistall(rects)], doreturn=False)
+            screen.set_clip(None)
+        self.updated = dirty
+        self.drawn = self.foreground()
+        self.particle_drawn = self.particle_rect
+        self.full = False
+
+    def foreground(self):
+        # Éléments de la frame hors particules
+        start, stop = self.particle_range
+        return set(self.items[:start] + self.items[stop:])
+
+    def draw(self, state, alpha=1.0, previous=None):
+        profiler = self.profiler
+        self.items = []
+        self.draw_world(state, alpha, previous)
+        start = profiler.begin()
+        self.draw_hud(state)
+        profiler.end("draw.hud", start)
+        start = profiler.begin()
+        self.draw_overlay(state)
+        profiler.end("draw.overlay", start)
+        start = profiler.begin()
+        self.update_screen(state.world)
+        profiler.end("draw.restore", start)
+        # Panneau du profileur par-dessus, restauré à la frame suivante
+        self.panel = self.draw_profiler(profiler) if profiler.enabled else None
+        if self.panel is not None and self.updated is not None:
+            self.updated.append(self.panel)
@@ -0,0 +1,111 @@
+# Enregistrement et rejeu déterministes des parties.
+# Un enregistrement contient la graine de la partie, le niveau de départ et le masque
+# d'entrées de chaque tick (un octet par tick, compressé avec zlib), suivis du résultat
+# attendu. Le rejeu refait la partie sans affichage, aussi vite que possible, et doit
+# retrouver exactement le même score, les mêmes vies et le même niveau.
+import struct
+import sys
+import time
+import zlib
+
+from simulation import GameState
+
+# En-tête : signature, version, niveau de départ, graine, nombre de ticks, puis le
+# résultat final (score, meilleur score, vies, niveau, état)
+MAGIC = b"MRPL"
+VERSION = 2
+HEADER = struct.Struct("<4sHHqIqqhHB")
+
+# États de fin de partie, rangés par code dans l'en-tête
+STATUSES = ("playing", "game_over", "victory")
+
+# Résultat d'une partie, comparé entre l'enregistrement et le rejeu
+def game_result(state):
+    return {
+        "score": state.player.score,
+        "high_score": state.high_score,
+        "lives": state.player.lives,
+        "level": state.current_level,
+        "status": state.status,
+    }
+
+# Enregistreur des entrées de chaque tick
+class InputRecorder:
+    def __init__(self, seed, level=1):
+        self.seed = seed
+        self.level = level
+        self.inputs = bytearray()  # Un masque d'entrées par tick
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, inputs):
+        self.inputs.append(inputs)
+
+    def to_bytes(self, state):
+        # Sérialisation avec le résultat de la partie enregistrée
+        result = game_result(state)
+        header = HEADER.pack(MAGIC, VERSION, self.level, self.seed, len(self.inputs),
+                             result["score"], result["high_score"], result["lives"],
+                             result["level"], STATUSES.index(result["status"]))
+        return header + zlib.compress(bytes(self.inputs), 9)
+
+    def save(self, path, state):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes(state))
+
+# Enregistrement relu, rejouable sans affichage
+class Replay:
+    def __init__(self, seed, level, inputs, expected=None):
+        self.seed = seed
+        self.level = level
+        self.inputs = inputs        # bytes : un masque d'entrées par tick
+        self.expected = expected    # Résultat enregistré (dictionnaire de game_result)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, level, seed, ticks, score, high_score, lives,
+         final_level, status) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Format d'enregistrement inconnu")
+        inputs = zlib.decompress(data[HEADER.size:])
+        if len(inputs) != ticks:
+            raise ValueError("Enregistrement tronqué")
+        expected = {"score": score, "high_score": high_score, "lives": lives,
+                    "level": final_level, "status": STATUSES[status]}
+        return cls(seed, level, inputs, expected)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def run(self):
+        # Rejeu de tous les ticks ; renvoie l'état final
+        state = GameState(self.level, self.seed)
+        step = state.step
+        for inputs in self.inputs:
+            step(inputs)
+        return state
+
+    def verify(self):
+        # Rejeu et comparaison avec le résultat enregistré ; renvoie (identique, résultat)
+        result = game_result(self.run())
+        return result == self.expected, result
+
+# Rejeu en ligne de commande : python replay.py partie.rpl [...]
+if __name__ == "__main__":
+    failed = False
+    for path in sys.argv[1:]:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        same, result = replay.verify()
+        elapsed = time.perf_counter() - start
+        ticks = len(replay.inputs)
+        print(f"{path}: {ticks} ticks en {elapsed:.3f} s ({ticks / max(elapsed, 1e-9):.0f} ticks/s) "
+              f"score={result['score']} vies={result['lives']} niveau={result['level']} "
+              f"état={result['status']} -> {'identique' if same else 'DIFFÉRENT'}")
+        if not same:
+            print(f"  attendu: {replay.expected}")
+            failed = True
+    sys.exit(1 if failed else 0)
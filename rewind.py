@@ -0,0 +1,488 @@
+# Retour en arrière dans la partie et reprise au début du niveau.
+# À chaque tick, l'état complet de la partie est capturé dans un tampon circulaire de
+# taille fixe. Il est rangé en deux parties :
+# - la structure (niveau, générateur aléatoire, plateformes restantes, ennemis, pièces,
+#   chunks actifs, suspendus ou libérés), qui ne change qu'avec une pièce ramassée, un
+#   ennemi tué, une plateforme cassée ou un déplacement de la zone active ;
+# - le mouvement (joueur, caméra, positions et directions des ennemis, boules de feu,
+#   animations), qui change à chaque tick.
+# Une image clé contient les deux parties ; elle est écrite toutes les KEYFRAME_INTERVAL
+# ticks et à chaque changement de structure. Les autres ticks ne gardent que les valeurs
+# du mouvement qui diffèrent de leur image clé (masque de bits + valeurs).
+#
+# Toutes les captures sont écrites dans une seule zone de float64 préallouée : quand elle
+# ou la table des captures est pleine, les plus anciennes sont effacées. La mémoire est
+# fixée à la création, quel que soit le niveau ; un niveau chargé garde moins d'historique.
+#
+# Une restauration qui garde la structure actuelle (même monde, rien de ramassé ni de
+# cassé depuis l'image clé) ne réécrit que le mouvement ; sinon le monde est reconstruit
+# à partir du niveau compilé et de l'image clé.
+#
+#   python rewind.py --level 1 --ticks 18000      coût des captures et des restaurations
+import argparse
+import time
+import weakref
+from collections import deque
+
+import numpy as np
+
+from enemies import EnemyManager
+from levels import level_cache
+from replay import STATUSES
+from simulation import GameState, Platform, Coin, Door, WIDTH
+from spatial import build_index
+from timestep import TICK_RATE
+from world import World, Camera
+
+# Durée d'historique gardée (secondes de jeu)
+REWIND_SECONDS = 300
+# Mémoire réservée aux captures (octets)
+REWIND_MEMORY = 16 * 1024 * 1024
+# Ticks entre deux images clés
+KEYFRAME_INTERVAL = 120
+# Points de reprise gardés (débuts des derniers niveaux joués)
+CHECKPOINTS = 8
+
+# Champs du joueur capturés, avec leur type
+PLAYER_FIELDS = (("x", float), ("y", float), ("vel_y", float), ("is_jumping", bool),
+                 ("facing_right", bool), ("moving", bool), ("score", int),
+                 ("coins_collected", int), ("lives", int), ("animation_frame", float),
+                 ("can_throw", bool), ("throw_cooldown", int))
+# Début du mouvement : tick, meilleur score, état, caméra, joueur, nombre de boules de feu
+SCALARS = 4 + len(PLAYER_FIELDS) + 1
+
+# En-tête de la structure : niveau, générations du monde et des ennemis, nombre de
+# plateformes du niveau, d'ennemis actifs, d'ennemis suspendus, de pièces et de chunks,
+# puis gauss_next du générateur (NaN si absent). Chaque chunk est ensuite décrit par
+# CHUNK_ACTIVE et CHUNK_SUSPENDED (ennemis suspendus, même aucun).
+STRUCTURE_HEADER = 9
+CHUNK_ACTIVE = 1
+CHUNK_SUSPENDED = 2
+RNG_WORDS = 625
+
+# Colonnes d'une capture dans la table (KEYFRAME : case de son image clé, -1 pour une
+# image clé ; STRUCTURE : taille de la structure d'une image clé ; LENGTH : taille du
+# mouvement ; COMPARED : valeurs comparées à l'image clé ; CHANGED : valeurs différentes)
+TICK, START, SIZE, KEYFRAME, STRUCTURE, LENGTH, COMPARED, CHANGED = range(8)
+RECORD_FIELDS = 8
+
+# Clé de structure : l'état a-t-il encore la structure capturée ? Les références faibles
+# ne retiennent pas en mémoire les mondes des niveaux quittés.
+def structure_key(state):
+    return (weakref.ref(state.world), state.world.generation, weakref.ref(state.enemies),
+            state.enemies.generation, len(state.coin_index), len(state.platforms))
+
+def same_structure(key, state):
+    return (key[0]() is state.world and key[1] == state.world.generation and
+            key[2]() is state.enemies and key[3] == state.enemies.generation and
+            key[4] == len(state.coin_index) and key[5] == len(state.platforms))
+
+# Mouvement d'un état : vecteur float64 dont la taille ne dépend que de la structure,
+# sauf les boules de feu rangées à la fin
+def encode_motion(state):
+    player = state.player
+    fireballs = player.fireballs
+    n = fireballs.count
+    enemies = state.enemies
+    scalars = [state.tick, state.high_score, STATUSES.index(state.status), state.camera.x]
+    scalars += [getattr(player, name) for name, _ in PLAYER_FIELDS]
+    scalars.append(n)
+    coins = [coin.animation_frame for chunk in state.world.chunks for coin in chunk.coins]
+    doors = [door.animation_frame for door in state.doors]
+    return np.concatenate((scalars, enemies.x, enemies.direction, enemies.animation_frame,
+                           coins, doors, fireballs.x[:n], fireballs.y[:n], fireballs.speed[:n]))
+
+def restore_motion(state, motion):
+    scalars = motion[:SCALARS].tolist()
+    state.tick = int(scalars[0])
+    state.high_score = int(scalars[1])
+    state.status = STATUSES[int(scalars[2])]
+    state.camera.x = scalars[3]
+    player = state.player
+    for (name, kind), value in zip(PLAYER_FIELDS, scalars[4:]):
+        setattr(player, name, kind(value))
+    enemies = state.enemies
+    i = SCALARS
+    for array in (enemies.x, enemies.direction, enemies.animation_frame):
+        array[:] = motion[i:i + len(array)]
+        i += len(array)
+    enemies.grid = None  # Positions réécrites : la grille part des positions courantes
+    for chunk in state.world.chunks:
+        for coin in chunk.coins:
+            coin.animation_frame = float(motion[i])
+            i += 1
+    for door in state.doors:
+        door.animation_frame = float(motion[i])
+        i += 1
+    fireballs = player.fireballs
+    n = fireballs.count = int(scalars[-1])
+    for array in (fireballs.x, fireballs.y, fireballs.speed):
+        array[:n] = motion[i:i + n]
+        i += n
+    fireballs.prev_x[:n] = fireballs.x[:n]  # Rien à interpoler après une restauration
+    state.events = []
+    state.effects = []
+
+# Masque des plateformes restantes parmi celles du niveau (elles ne font que disparaître,
+# dans l'ordre du niveau)
+def platform_mask(state, level):
+    rows = level.platforms.tolist()
+    if len(rows) == len(state.platforms):
+        return np.ones(len(rows))
+    mask = np.zeros(len(rows))
+    platforms = state.platforms
+    j = 0
+    for i, (x, y, width, breakable) in enumerate(rows):
+        if j < len(platforms):
+            platform = platforms[j]
+            if (platform.x == x and platform.y == y and platform.width == width and
+                    platform.is_breakable == bool(breakable)):
+                mask[i] = 1
+                j += 1
+    return mask
+
+def encode_structure(state):
+    level = level_cache.get(state.current_level)
+    world = state.world
+    enemies = state.enemies
+    version, rng_state, gauss_next = state.rng.getstate()
+    # Ennemis suspendus : chunk puis champs de EnemyManager.FIELDS
+    suspended = [(chunk.index, chunk.enemies) for chunk in world.chunks if chunk.enemies is not None]
+    suspended_count = sum(len(rows["x"]) for _, rows in suspended)
+    # Pièces des chunks dans l'ordre : objets (0) ou coordonnées libérées (1)
+    coins = []
+    for chunk in world.chunks:
+        coins += [(coin.x, coin.y, 0) for coin in chunk.coins]
+        if chunk.released is not None:
+            coins += [(x, y, 1) for x, y in chunk.released.tolist()]
+    header = [state.current_level, world.generation, enemies.generation, len(level.platforms),
+              len(enemies), suspended_count, len(coins), len(world.chunks),
+              np.nan if gauss_next is None else gauss_next]
+    parts = [header, rng_state, platform_mask(state, level)]
+    parts += [getattr(enemies, name) for name in EnemyManager.FIELDS]
+    if suspended:
+        parts.append(np.concatenate([np.full(len(rows["x"]), index) for index, rows in suspended]))
+        parts += [np.concatenate([rows[name] for _, rows in suspended]) for name in EnemyManager.FIELDS]
+    if coins:
+        parts.append(np.array(coins, np.float64).T.ravel())
+    parts.append([CHUNK_ACTIVE * chunk.active + CHUNK_SUSPENDED * (chunk.enemies is not None)
+                  for chunk in world.chunks])
+    return np.concatenate(parts).astype(np.float64)
+
+def restore_structure(state, structure):
+    # Reconstruction du niveau tel qu'il était : mêmes objets que GameState.load()
+    (level_number, world_generation, enemy_generation, platform_count, enemy_count,
+     suspended_count, coin_count, chunk_count, gauss_next) = structure[:STRUCTURE_HEADER].tolist()
+    level_number = int(level_number)
+    level = level_cache.get(level_number)
+    i = STRUCTURE_HEADER
+    rng_state = tuple(int(value) for value in structure[i:i + RNG_WORDS].tolist())
+    i += RNG_WORDS
+    state.rng.setstate((state.rng.VERSION, rng_state, None if np.isnan(gauss_next) else gauss_next))
+    mask = structure[i:i + int(platform_count)] > 0
+    i += int(platform_count)
+    platforms = [Platform(x, y, width, bool(breakable))
+                 for x, y, width, breakable in level.platforms[mask].tolist()]
+
+    def columns(count, fields):
+        nonlocal i
+        arrays = {}
+        for name in fields:
+            arrays[name] = structure[i:i + count].copy()
+            i += count
+        return arrays
+
+    engine = columns(int(enemy_count), EnemyManager.FIELDS)
+    enemies = EnemyManager(engine["x"], engine["y"], engine["speed"], engine["min_x"],
+                           engine["max_x"], engine["type"])
+    enemies.direction = engine["direction"]
+    enemies.animation_frame = engine["animation_frame"]
+    enemies.generation = int(enemy_generation)
+    suspended = columns(int(suspended_count), ("chunk",) + EnemyManager.FIELDS) if suspended_count else None
+    coins = columns(int(coin_count), ("x", "y", "released")) if coin_count else None
+    flags = structure[i:i + int(chunk_count)].astype(np.int64).tolist()
+
+    objects = []
+    released = []
+    if coins is not None:
+        for x, y, flag in zip(coins["x"].tolist(), coins["y"].tolist(), coins["released"].tolist()):
+            if flag:
+                released.append((int(x), int(y)))
+            else:
+                objects.append(Coin(int(x), int(y)))
+    doors = [Door(x, y, next_level, coins_required)
+             for x, y, next_level, coins_required in level.doors.tolist()]
+    width = max(WIDTH, level.width)
+    world = World(platforms, objects, doors, width, Coin)
+    for chunk, flag in zip(world.chunks, flags):
+        chunk.active = bool(flag & CHUNK_ACTIVE)
+        if flag & CHUNK_SUSPENDED:
+            rows = suspended["chunk"] == chunk.index if suspended is not None else slice(0, 0)
+            chunk.enemies = {name: (suspended[name][rows] if suspended is not None else np.empty(0))
+                             .astype(getattr(enemies, name).dtype) for name in EnemyManager.FIELDS}
+    world.active = [chunk for chunk in world.chunks if chunk.active]
+    world.generation = int(world_generation)
+    # Pièces libérées, regroupées par chunk dans leur ordre
+    chunks = {}
+    for x, y in released:
+        chunks.setdefault(world.chunk_index(x), []).append((x, y))
+    for index, positions in chunks.items():
+        world.chunks[index].released = np.array(positions, np.int32).reshape(-1, 2)
+
+    state.current_level = level_number
+    state.platforms = platforms
+    state.doors = doors
+    state.enemies = enemies
+    state.platform_index = build_index(platforms)
+    state.coin_index = build_index(objects)
+    state.door_index = build_index(doors)
+    state.world = world
+    state.camera = Camera(width, WIDTH)
+
+class RewindBuffer:
+    def __init__(self, seconds=REWIND_SECONDS, memory=REWIND_MEMORY,
+                 keyframe_interval=KEYFRAME_INTERVAL, tick_rate=TICK_RATE):
+        self.capacity = max(1, int(seconds * tick_rate))   # Nombre maximal de captures
+        self.data = np.zeros(max(1, memory // 8))          # Zone des captures
+        self.records = np.zeros((self.capacity, RECORD_FIELDS), np.int64)
+        self.keyframe_interval = keyframe_interval
+        self.first = 0       # Case de la plus ancienne capture
+        self.count = 0       # Nombre de captures gardées
+        self.head = 0        # Prochain mot libre de la zone
+        self.keys = {}       # Case d'une image clé -> clé de structure
+        self.key_slot = -1   # Image clé des prochaines captures (-1 : aucune)
+        self.key_motion = None
+        # Débuts de niveau : [tick, structure, mouvement, clé], le plus récent à la fin
+        self.checkpoints = deque(maxlen=CHECKPOINTS)
+        self.world = None    # Monde de la dernière capture ou restauration (référence faible)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.first = self.count = self.head = 0
+        self.keys.clear()
+        self.key_slot = -1
+        self.key_motion = None
+
+    @property
+    def first_tick(self):
+        return int(self.records[self.first, TICK])
+
+    @property
+    def last_tick(self):
+        return int(self.records[(self.first + self.count - 1) % self.capacity, TICK])
+
+    @property
+    def used(self):
+        # Mots de la zone occupés par les captures gardées
+        if not self.count:
+            return 0
+        start = int(self.records[self.first, START])
+        return (self.head - start) % len(self.data) or len(self.data)
+
+    def slot(self, tick):
+        # Case de la capture du tick, ou -1 si elle n'est plus (ou pas) dans le tampon
+        if not self.count or not self.first_tick <= tick <= self.last_tick:
+            return -1
+        return (self.first + tick - self.first_tick) % self.capacity
+
+    def evict(self):
+        self.keys.pop(self.first, None)
+        if self.first == self.key_slot:
+            self.key_slot = -1
+            self.key_motion = None
+        self.first = (self.first + 1) % self.capacity
+        self.count -= 1
+
+    def allocate(self, words):
+        # Place pour `words` mots après la dernière capture ; les plus anciennes sont
+        # effacées, ainsi que les deltas dont l'image clé a disparu
+        if self.count == self.capacity:
+            self.evict()
+        if self.head + words > len(self.data):
+            # Pas assez de place jusqu'à la fin de la zone : les captures rangées après
+            # la tête (les plus anciennes) sont effacées et l'écriture reprend au début
+            while self.count and self.records[self.first, START] >= self.head:
+                self.evict()
+            self.head = 0
+        while self.count:
+            start = self.records[self.first, START]
+            if start + self.records[self.first, SIZE] <= self.head or start >= self.head + words:
+                break
+            self.evict()
+        while self.count and self.records[self.first, KEYFRAME] >= 0:
+            self.evict()
+        start = self.head
+        self.head += words
+        return start
+
+    def push(self, tick, start, size, keyframe=-1, structure=0, length=0, compared=0, changed=0):
+        slot = (self.first + self.count) % self.capacity
+        self.records[slot] = (tick, start, size, keyframe, structure, length, compared, changed)
+        self.count += 1
+        return slot
+
+    def truncate(self, tick):
+        # Oubli des captures postérieures à `tick` (après un retour en arrière)
+        while self.count and self.last_tick > tick:
+            last = (self.first + self.count - 1) % self.capacity
+            self.keys.pop(last, None)
+            self.count -= 1
+            self.head = int(self.records[last, START])
+        while self.checkpoints and self.checkpoints[-1][0] > tick:
+            self.checkpoints.pop()
+        if not self.count:
+            self.clear()
+            return
+        last = (self.first + self.count - 1) % self.capacity
+        record = self.records[last]
+        self.key_slot = last if record[KEYFRAME] < 0 else int(record[KEYFRAME])
+        self.key_motion = self.keyframe_motion(self.key_slot)
+
+    def capture(self, state):
+        # Capture de l'état après un tick. Quelques dizaines de microsecondes dans le cas courant :
+        # un vecteur de mouvement comparé à celui de l'image clé.
+        if self.count and state.tick != self.last_tick + 1:
+            self.truncate(state.tick - 1)
+            if self.count and state.tick != self.last_tick + 1:
+                self.clear()
+        if self.world is None or self.world() is not state.world:
+            # Niveau chargé par la partie (nouveau niveau ou nouvelle partie)
+            self.world = weakref.ref(state.world)
+            if state.status == "playing":
+                self.checkpoints.append([state.tick, encode_structure(state), encode_motion(state),
+                                         structure_key(state)])
+        motion = encode_motion(state)
+        if (self.key_slot < 0 or state.tick - self.records[self.key_slot, TICK] >= self.keyframe_interval or
+                not same_structure(self.keys[self.key_slot], state) or not self.write_delta(state.tick, motion)):
+            self.write_keyframe(state, motion)
+
+    def write_keyframe(self, state, motion):
+        structure = encode_structure(state)
+        size = len(structure) + len(motion)
+        if size > len(self.data):
+            self.clear()  # Zone trop petite pour une seule image clé : pas d'historique
+            return
+        start = self.allocate(size)
+        self.data[start:start + len(structure)] = structure
+        self.data[start + len(structure):start + size] = motion
+        slot = self.push(state.tick, start, size, structure=len(structure), length=len(motion))
+        self.keys[slot] = structure_key(state)
+        self.key_slot = slot
+        self.key_motion = motion
+
+    def write_delta(self, tick, motion):
+        # Renvoie False si l'image clé a dû être effacée pour faire de la place
+        key = self.key_motion
+        compared = min(len(key), len(motion))
+        changed = motion[:compared] != key[:compared]
+        values = np.concatenate((motion[:compared][changed], motion[compared:]))
+        mask = np.packbits(changed)
+        size = len(values) + (len(mask) + 7) // 8
+        key_slot = self.key_slot
+        start = self.allocate(size)
+        if self.key_slot != key_slot:
+            self.head = start
+            return False
+        self.data[start:start + len(values)] = values
+        self.data[start + len(values):start + size].view(np.uint8)[:len(mask)] = mask
+        self.push(tick, start, size, keyframe=key_slot, length=len(motion), compared=compared,
+                  changed=len(values) - (len(motion) - compared))
+        return True
+
+    def keyframe_motion(self, slot):
+        record = self.records[slot]
+        start = int(record[START] + record[STRUCTURE])
+        return self.data[start:start + int(record[LENGTH])].copy()
+
+    def motion(self, slot):
+        # Mouvement complet d'une capture : image clé + valeurs modifiées
+        record = self.records[slot]
+        if record[KEYFRAME] < 0:
+            return self.keyframe_motion(slot)
+        motion = self.keyframe_motion(int(record[KEYFRAME]))
+        length, compared, changed = int(record[LENGTH]), int(record[COMPARED]), int(record[CHANGED])
+        start = int(record[START])
+        stop = start + changed + length - compared
+        values = self.data[start:stop]
+        mask = np.unpackbits(self.data[stop:stop + (compared + 63) // 64].view(np.uint8),
+                             count=compared).astype(bool)
+        motion = np.resize(motion, length) if length != len(motion) else motion
+        motion[:compared][mask] = values[:changed]
+        motion[compared:] = values[changed:]
+        return motion
+
+    def apply(self, state, structure, motion, key):
+        # Restauration d'une structure (si l'état ne l'a plus) puis d'un mouvement ;
+        # renvoie la clé de structure de l'état restauré
+        if not same_structure(key, state):
+            restore_structure(state, structure)
+            key = structure_key(state)
+            self.world = weakref.ref(state.world)
+        restore_motion(state, motion)
+        return key
+
+    def restore(self, state, tick):
+        # Remet la partie dans son état à la fin du tick `tick` et oublie les captures
+        # suivantes. Renvoie False si ce tick n'est plus dans le tampon.
+        slot = self.slot(tick)
+        if slot < 0:
+            return False
+        record = self.records[slot]
+        key_slot = slot if record[KEYFRAME] < 0 else int(record[KEYFRAME])
+        start = int(self.records[key_slot, START])
+        structure = self.data[start:start + int(self.records[key_slot, STRUCTURE])]
+        self.keys[key_slot] = self.apply(state, structure, self.motion(slot), self.keys[key_slot])
+        self.truncate(tick)
+        return True
+
+    def rewind(self, state, ticks=1):
+        # Recul de `ticks` ticks (un appel par tick pour un retour en arrière continu)
+        return self.count > 1 and self.restore(state, max(self.first_tick, self.last_tick - ticks))
+
+    def retry(self, state):
+        # Reprise au début du dernier niveau joué, même après un game over
+        if not self.checkpoints:
+            return False
+        checkpoint = self.checkpoints[-1]
+        tick, structure, motion, key = checkpoint
+        checkpoint[3] = self.apply(state, structure, motion, key)
+        self.truncate(tick)
+        return True
+
+# Coût des captures et des restaurations sur une partie aux entrées pseudo-aléatoires
+def main(argv=None):
+    from runner import random_policy
+    parser = argparse.ArgumentParser(description="Mesure du tampon de retour en arrière")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=REWIND_SECONDS * TICK_RATE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", type=int, default=REWIND_MEMORY // (1024 * 1024), help="mémoire en Mo")
+    args = parser.parse_args(argv)
+
+    state = GameState(args.level, args.seed)
+    buffer = RewindBuffer(memory=args.memory * 1024 * 1024)
+    policy = random_policy(args.seed)
+    capture = 0.0
+    for tick in range(args.ticks):
+        state.step(policy(tick))
+        if state.status != "playing":
+            state.reset(args.level)
+        start = time.perf_counter()
+        buffer.capture(state)
+        capture += time.perf_counter() - start
+    history = len(buffer)
+    used = buffer.used * 8
+    start = time.perf_counter()
+    restores = 0
+    while buffer.rewind(state, 10):
+        restores += 1
+    restore = time.perf_counter() - start
+    print(f"{args.ticks} ticks : capture {capture / args.ticks * 1e6:.1f} µs/tick, "
+          f"{history} ticks gardés ({history / TICK_RATE:.0f} s), {used / 1024 / 1024:.2f} Mo "
+          f"({used / max(history, 1):.0f} octets/tick)")
+    print(f"{restores} restaurations : {restore / max(restores, 1) * 1e6:.1f} µs chacune")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# Exécution de nombreuses parties sans affichage sur tous les cœurs (tests d'endurance
+# et d'équilibrage). Chaque partie est définie par une graine, un niveau, une politique
+# d'entrées (ou un enregistrement à rejouer) et une durée maximale.
+#
+# Les définitions des parties, leurs résultats et leurs observations finales sont rangés
+# dans des blocs de mémoire partagée : les processus ne reçoivent que des tranches
+# d'indices à traiter et n'échangent que de petites statistiques, sans sérialiser les
+# parties elles-mêmes.
+#
+#   python runner.py --episodes 10000 --policy random --level 1
+#   python runner.py --replay partie1.rpl partie2.rpl      rejoue et vérifie en parallèle
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from environment import OBS_SIZE, observe_state
+from replay import STATUSES, Replay, game_result
+from simulation import GameState, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_FIRE
+
+# Durée maximale d'une partie par défaut (une minute de jeu)
+MAX_TICKS = 3600
+
+# Définition d'une partie (policy : indice dans POLICIES, replay : indice du fichier ou -1)
+SPEC_DTYPE = np.dtype([("seed", np.int64), ("level", np.int64), ("policy", np.int64),
+                       ("max_ticks", np.int64), ("replay", np.int64)])
+
+# Résultat d'une partie (status : indice dans STATUSES, match : rejeu identique ou -1)
+RESULT_DTYPE = np.dtype([("score", np.int64), ("high_score", np.int64), ("lives", np.int64),
+                         ("level", np.int64), ("status", np.int64), ("ticks", np.int64),
+                         ("elapsed", np.float64), ("worker", np.int64), ("match", np.int64)])
+
+# Politiques d'entrées : fabrique(graine) -> fonction(tick) -> masque d'entrées
+def idle_policy(seed):
+    return lambda tick: 0
+
+def random_policy(seed):
+    # Direction tirée toutes les 45 ticks, sauts et tirs au hasard
+    rng = random.Random(seed)
+    held = INPUT_RIGHT
+
+    def inputs(tick):
+        nonlocal held
+        if tick % 45 == 0:
+            held = rng.choice((INPUT_LEFT, INPUT_RIGHT, INPUT_RIGHT, 0))
+        pressed = INPUT_JUMP if rng.random() < 0.05 else 0
+        pressed |= INPUT_FIRE if rng.random() < 0.05 else 0
+        return held | pressed
+    return inputs
+
+def runner_policy(seed):
+    # Course vers la droite, saut toutes les 30 ticks et tir toutes les 20
+    return lambda tick: (INPUT_RIGHT | (INPUT_JUMP if tick % 30 == 0 else 0) |
+                         (INPUT_FIRE if tick % 20 == 0 else 0))
+
+POLICIES = {
+    "idle": idle_policy,
+    "random": random_policy,
+    "runner": runner_policy,
+    "replay": None,  # Entrées lues dans un enregistrement
+}
+POLICY_NAMES = list(POLICIES)
+
+# Blocs de mémoire partagée vus comme des tableaux NumPy
+def shared_array(dtype, shape, name=None):
+    size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+    block = shared_memory.SharedMemory(name=name, create=name is None, size=size if name is None else 0)
+    return block, np.ndarray(shape, dtype, buffer=block.buf)
+
+# État d'un processus de travail (blocs partagés attachés une fois par processus)
+worker = {}
+
+def init_worker(names, count, replay_paths):
+    blocks = []
+    for key, dtype, shape in (("specs", SPEC_DTYPE, (count,)), ("results", RESULT_DTYPE, (count,)),
+                              ("observations", np.float32, (count, OBS_SIZE))):
+        block, array = shared_array(dtype, shape, names[key])
+        blocks.append(block)
+        worker[key] = array
+    worker["blocks"] = blocks
+    worker["replay_paths"] = replay_paths
+    worker["replays"] = {}
+
+def run_episode(spec, observation):
+    # Joue une partie ; renvoie (état final, ticks joués, rejeu identique ou -1)
+    if spec["replay"] >= 0:
+        replays = worker["replays"]
+        index = int(spec["replay"])
+        replay = replays.get(index)
+        if replay is None:
+            replay = replays[index] = Replay.load(worker["replay_paths"][index])
+        state = replay.run()
+        observe_state(state, observation)
+        return state, len(replay.inputs), int(game_result(state) == replay.expected)
+    state = GameState(int(spec["level"]), int(spec["seed"]))
+    policy = POLICIES[POLICY_NAMES[spec["policy"]]](int(spec["seed"]))
+    step = state.step
+    ticks = 0
+    for tick in range(int(spec["max_ticks"])):
+        step(policy(tick))
+        ticks += 1
+        if state.status != "playing":
+            break
+    observe_state(state, observation)
+    return state, ticks, -1
+
+def run_shard(start, stop):
+    # Joue les parties [start, stop) et écrit leurs résultats en mémoire partagée
+    specs, results, observations = worker["specs"], worker["results"], worker["observations"]
+    pid = os.getpid()
+    ticks = 0
+    begin = time.perf_counter()
+    for i in range(start, stop):
+        episode_start = time.perf_counter()
+        state, episode_ticks, match = run_episode(specs[i], observations[i])
+        results[i] = (state.player.score, state.high_score, state.player.lives, state.current_level,
+                      STATUSES.index(state.status), episode_ticks,
+                      time.perf_counter() - episode_start, pid, match)
+        ticks += episode_ticks
+    return {"worker": pid, "episodes": stop - start, "ticks": ticks,
+            "busy": time.perf_counter() - begin}
+
+# Lancement d'un lot de parties sur `workers` processus.
+# Renvoie (résultats, observations finales, statistiques).
+def run_episodes(specs, workers=None, replay_paths=(), shards_per_worker=4):
+    workers = workers or os.cpu_count() or 1
+    count = len(specs)
+    blocks = {}
+    try:
+        arrays = {}
+        for key, dtype, shape in (("specs", SPEC_DTYPE, (count,)), ("results", RESULT_DTYPE, (count,)),
+                                  ("observations", np.float32, (count, OBS_SIZE))):
+            blocks[key], arrays[key] = shared_array(dtype, shape)
+        arrays["specs"][:] = specs
+        names = {key: block.name for key, block in blocks.items()}
+
+        # Tranches plus petites que la part de chaque processus, pour équilibrer la charge
+        shard = max(1, -(-count // (workers * shards_per_worker)))
+        start = time.perf_counter()
+        with ProcessPoolExecutor(workers, initializer=init_worker,
+                                 initargs=(names, count, list(replay_paths))) as executor:
+            futures = [executor.submit(run_shard, i, min(i + shard, count))
+                       for i in range(0, count, shard)]
+            shards = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+
+        results = arrays["results"].copy()
+        observations = arrays["observations"].copy()
+        del arrays
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    per_worker = {}
+    for stats in shards:
+        entry = per_worker.setdefault(stats["worker"], {"episodes": 0, "ticks": 0, "busy": 0.0})
+        for key in entry:
+            entry[key] += stats[key]
+    ticks = int(results["ticks"].sum())
+    summary = {
+        "episodes": count,
+        "workers": workers,
+        "elapsed": elapsed,
+        "ticks": ticks,
+        "ticks_per_second": ticks / elapsed if elapsed else 0.0,
+        "episodes_per_second": count / elapsed if elapsed else 0.0,
+        "statuses": {status: int((results["status"] == code).sum()) for code, status in enumerate(STATUSES)},
+        "mean_score": float(results["score"].mean()) if count else 0.0,
+        "replay_mismatches": int((results["match"] == 0).sum()),
+        "per_worker": [dict(worker=pid, ticks_per_second=entry["ticks"] / entry["busy"] if entry["busy"] else 0.0,
+                            **entry)
+                       for pid, entry in sorted(per_worker.items())],
+    }
+    return results, observations, summary
+
+# Définitions de `episodes` parties de graines successives
+def make_specs(episodes, level=1, policy="random", seed=0, max_ticks=MAX_TICKS):
+    specs = np.zeros(episodes, SPEC_DTYPE)
+    specs["seed"] = seed + np.arange(episodes)
+    specs["level"] = level
+    specs["policy"] = POLICY_NAMES.index(policy)
+    specs["max_ticks"] = max_ticks
+    specs["replay"] = -1
+    return specs
+
+def replay_specs(paths):
+    specs = np.zeros(len(paths), SPEC_DTYPE)
+    specs["policy"] = POLICY_NAMES.index("replay")
+    specs["replay"] = np.arange(len(paths))
+    return specs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parties sans affichage en parallèle")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--policy", choices=[name for name in POLICY_NAMES if name != "replay"], default="random")
+    parser.add_argument("--seed", type=int, default=0, help="graine de la première partie")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--replay", nargs="+", metavar="FICHIER", help="rejoue et vérifie ces enregistrements")
+    parser.add_argument("--output", help="fichier JSON du résumé")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        specs = replay_specs(args.replay)
+    else:
+        specs = make_specs(args.episodes, args.level, args.policy, args.seed, args.max_ticks)
+    _, _, summary = run_episodes(specs, args.workers, args.replay or ())
+
+    print(f"{summary['episodes']} parties, {summary['ticks']} ticks en {summary['elapsed']:.2f} s "
+          f"sur {summary['workers']} processus : {summary['ticks_per_second']:,.0f} ticks/s, "
+          f"{summary['episodes_per_second']:.1f} parties/s")
+    print("  " + ", ".join(f"{status}: {n}" for status, n in summary["statuses"].items()) +
+          f", score moyen {summary['mean_score']:.0f}")
+    for entry in summary["per_worker"]:
+        print(f"  processus {entry['worker']}: {entry['episodes']} parties, {entry['ticks']} ticks, "
+              f"{entry['busy']:.2f} s actif, {entry['ticks_per_second']:,.0f} ticks/s")
+    if args.replay:
+        print(f"  rejeux différents : {summary['replay_mismatches']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["replay_mismatches"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# Cadence des frames selon l'activité de la scène. En jeu, la boucle tourne toujours à
+# pleine cadence, même si le joueur garde une touche enfoncée sans autre événement ; sur
+# le menu (seule scène qui le permet, voir tick(idle_ok=True)) sans action du joueur
+# depuis IDLE_AFTER secondes, elle descend à IDLE_FPS, et sur les écrans figés (game
+# over, victoire) à STATIC_FPS. Entre deux frames
+# lentes, le processus dort dans pygame.event.wait : le premier événement le réveille
+# aussitôt et une action du joueur ramène la pleine cadence.
+import time
+
+import pygame
+
+# Cadence normale
+FPS = 60
+# Cadence d'une scène animée sans action du joueur (menu laissé à lui-même)
+IDLE_FPS = 20
+# Cadence d'une scène figée (seuls les nuages défilent derrière le voile)
+STATIC_FPS = 4
+# Délai sans action du joueur avant de passer à IDLE_FPS (secondes)
+IDLE_AFTER = 10.0
+
+# Événements qui comptent comme une action du joueur
+INPUT_EVENTS = {pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+                pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL,
+                pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYAXISMOTION}
+
+class FrameScheduler:
+    def __init__(self, clock, fps=FPS, idle_fps=IDLE_FPS, static_fps=STATIC_FPS, idle_after=IDLE_AFTER):
+        self.clock = clock
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.static_fps = static_fps
+        self.idle_after = idle_after
+        self.pending = []                    # Événement qui a réveillé la dernière attente
+        self.last_input = time.monotonic()   # Dernière action du joueur
+        self.frame_end = time.perf_counter() # Fin de la frame précédente
+        self.rate = fps                      # Cadence de la dernière frame
+        self.frames = 1                      # Frames à pleine cadence couvertes par la dernière frame
+
+    def events(self):
+        # Événements de la frame (remplace pygame.event.get())
+        events = self.pending + pygame.event.get()
+        self.pending = []
+        if any(event.type in INPUT_EVENTS for event in events):
+            self.last_input = time.monotonic()
+        return events
+
+    @property
+    def idle(self):
+        return time.monotonic() - self.last_input >= self.idle_after
+
+    def tick(self, static=False, idle_ok=False):
+        # Fin de frame : attend la frame suivante (remplace clock.tick(FPS)).
+        # `idle_ok` autorise IDLE_FPS sans action du joueur : jamais en jeu, où une touche
+        # maintenue ne produit pas d'événement.
+        # Renvoie la durée à simuler en secondes : le temps réel écoulé, sauf sur une
+        # scène figée où rien ne bouge et où une seule frame normale est comptée.
+        if not static and not (idle_ok and self.idle):
+            self.rate = self.fps
+            self.frames = 1
+            frame_time = self.clock.tick(self.fps) / 1000
+            self.frame_end = time.perf_counter()
+            return frame_time
+
+        self.rate = self.static_fps if static else self.idle_fps
+        remaining = 1 / self.rate - (time.perf_counter() - self.frame_end)
+        if remaining > 0:
+            event = pygame.event.wait(int(remaining * 1000))
+            if event.type != pygame.NOEVENT:
+                self.pending.append(event)  # Rendu par le prochain events()
+        frame_time = self.clock.tick() / 1000
+        self.frame_end = time.perf_counter()
+        if static:
+            self.frames = 1
+            return 1 / self.fps
+        self.frames = max(1, round(frame_time * self.fps))
+        return frame_time
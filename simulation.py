@@ -0,0 +1,385 @@
+# Cœur de simulation du jeu, sans affichage, sans son et sans police.
+# Ce module n'importe pas pygame : il peut tourner en CI ou sur un serveur,
+# bien plus vite que le temps réel.
+import random
+
+from enemies import ENEMY_TYPES, EnemyManager
+from levels import RANDOM_TYPE, level_cache
+from profiler import NULL_PROFILER
+from projectiles import ProjectilePool
+from spatial import build_index
+from world import Camera, World
+
+# Dimensions de la fenêtre ; un niveau peut être plus large (voir world.py)
+WIDTH, HEIGHT = 800, 600
+
+# Entrées d'un tick, sous forme de masque de bits
+INPUT_LEFT = 1      # Flèche gauche maintenue
+INPUT_RIGHT = 2     # Flèche droite maintenue
+INPUT_JUMP = 4      # Espace pressé pendant ce tick
+INPUT_FIRE = 8      # F pressé pendant ce tick
+INPUT_RESET = 16    # R pressé pendant ce tick
+INPUT_RESTART = 32  # Entrée pressée pendant ce tick (après game over ou victoire)
+
+# Classe du joueur (Mario)
+class Player:
+    def __init__(self):
+        # Propriétés physiques du joueur
+        self.width = 40      # Largeur
+        self.height = 60     # Hauteur
+        self.depth = 15      # Profondeur (pour l'effet 3D)
+        self.x = 100         # Position horizontale initiale
+        self.y = HEIGHT - 150 # Position verticale initiale
+        self.vel_y = 0       # Vitesse verticale
+        self.jump_power = -15 # Puissance du saut (négatif car vers le haut)
+        self.gravity = 0.8   # Force de gravité
+        self.is_jumping = False # État de saut
+        self.speed = 5       # Vitesse de déplacement horizontal
+        self.facing_right = True # Direction du regard
+        self.moving = False  # Déplacement horizontal en cours (pour l'animation)
+        self.score = 0       # Score du joueur
+        self.coins_collected = 0 # Nombre de pièces collectées
+        self.lives = 3       # Nombre de vies
+        self.animation_frame = 0 # Frame d'animation courante
+        self.animation_speed = 0.3 # Vitesse d'animation
+        self.fireballs = ProjectilePool() # Boules de feu lancées
+        self.can_throw = True # Possibilité de lancer une boule de feu
+        self.throw_cooldown = 20 # Délai entre les lancés
+
+    def move(self, inputs):
+        # Déplacement horizontal selon les flèches maintenues
+        self.moving = bool(inputs & (INPUT_LEFT | INPUT_RIGHT))
+        if inputs & INPUT_LEFT:
+            self.x -= self.speed  # Déplacement vers la gauche
+            self.facing_right = False
+        if inputs & INPUT_RIGHT:
+            self.x += self.speed  # Déplacement vers la droite
+            self.facing_right = True
+
+    def respawn(self):
+        # Retour au point de départ après une vie perdue
+        self.x = 100
+        self.y = HEIGHT - 150
+        self.vel_y = 0
+
+    def update(self, state):
+        # Mise à jour de la position et de l'état du joueur.
+        # Les collisions ne testent que les entités des cellules voisines (index spatiaux
+        # de l'état) ; les sons à jouer sont ajoutés à state.events plutôt que joués ici.
+        events = state.events
+        # Animation lors du déplacement
+        if self.moving:
+            self.animation_frame += self.animation_speed
+
+        # Application de la gravité
+        self.vel_y += self.gravity
+        self.y += self.vel_y
+
+        # Gestion du sol
+        if self.y > HEIGHT - self.height:
+            self.y = HEIGHT - self.height
+            self.vel_y = 0
+            self.is_jumping = False
+
+        # Coup de tête en montant dans des plateformes cassables : elles se brisent et
+        # Mario retombe
+        if self.vel_y < 0:
+            broken = [platform for platform in state.platform_index.query(self.x, self.y, self.width, 0)
+                      if (platform.is_breakable and
+                          platform.y <= self.y <= platform.y + platform.height and
+                          self.x + self.width > platform.x and
+                          self.x < platform.x + platform.width)]
+            if broken:
+                for platform in broken:
+                    state.break_platform(platform)
+                self.vel_y = 0
+                self.score += 50 * len(broken)
+
+        # Collision avec les plateformes : bande sous les pieds du joueur, assez haute
+        # pour couvrir aussi une plateforme atteinte après un premier atterrissage
+        for platform in state.platform_index.query(self.x, self.y + self.height - 40, self.width, 40):
+            if (self.y + self.height >= platform.y and
+                self.y + self.height <= platform.y + 20 and
+                self.x + self.width > platform.x and
+                self.x < platform.x + platform.width and
+                self.vel_y >= 0):
+                self.y = platform.y - self.height
+                self.vel_y = 0
+                self.is_jumping = False
+
+        # Collecte des pièces
+        for coin in state.coin_index.query(self.x, self.y, self.width, self.height):
+            if (self.x + self.width > coin.x and
+                self.x < coin.x + coin.size and
+                self.y + self.height > coin.y and
+                self.y < coin.y + coin.size):
+                state.remove_coin(coin)
+                self.score += 100
+                self.coins_collected += 1
+                events.append("coin")
+                state.effects.append(("coin", coin.x + coin.size / 2, coin.y + coin.size / 2))
+
+        # Collision avec les ennemis : candidats calculés en bloc par le moteur NumPy
+        enemies = state.enemies
+        for i in enemies.overlapping(self.x, self.y, self.width, self.height):
+            enemy_x = enemies.x[i]
+            enemy_y = enemies.y[i]
+            if (self.x + self.width > enemy_x and
+                self.x < enemy_x + enemies.width and
+                self.y + self.height > enemy_y and
+                self.y < enemy_y + enemies.height):
+                # Si Mario saute sur un ennemi
+                if self.vel_y > 0 and self.y + self.height < enemy_y + enemies.height/2:
+                    enemies.kill(i)
+                    self.vel_y = self.jump_power/2
+                    self.score += 200
+                    state.effects.append(("stomp", enemy_x + enemies.width / 2, enemy_y + enemies.height))
+                else:
+                    # Si Mario est touché par un ennemi
+                    self.lives -= 1
+                    self.respawn()
+                    if self.lives <= 0:
+                        events.append("game_over")
+                        return "game_over"
+
+        # Chute hors de l'écran
+        if self.y > HEIGHT:
+            self.lives -= 1
+            self.respawn()
+            if self.lives <= 0:
+                events.append("game_over")
+                return "game_over"
+
+        # Interaction avec les portes
+        for door in state.door_index.query(self.x, self.y, self.width, self.height):
+            if (self.x + self.width > door.x and
+                self.x < door.x + door.width and
+                self.y + self.height > door.y and
+                self.y < door.y + door.height and
+                self.coins_collected >= door.coins_required):
+                events.append("victory")
+                return door.next_level
+
+        # Mise à jour des boules de feu (retirées une fois sorties de l'écran)
+        camera_x = state.camera.x
+        hits = []
+        self.score += 300 * self.fireballs.update(enemies, camera_x, camera_x + WIDTH, hits)
+        for x, y in hits:
+            state.effects.append(("kill", x, y))
+        # Boules de feu contre les plateformes cassables
+        broken = self.fireballs.hit_platforms(state.platform_index)
+        for platform in broken:
+            state.break_platform(platform)
+        self.score += 50 * len(broken)
+
+        # Gestion du délai entre les lancés de boules de feu
+        if not self.can_throw:
+            self.throw_cooldown -= 1
+            if self.throw_cooldown <= 0:
+                self.can_throw = True
+                self.throw_cooldown = 20
+
+        return state.current_level
+
+    def jump(self):
+        # Gestion du saut, renvoie True si le saut a eu lieu
+        if not self.is_jumping:
+            self.vel_y = self.jump_power
+            self.is_jumping = True
+            return True
+        return False
+
+    def throw_fireball(self):
+        # Lancement d'une boule de feu, renvoie True si elle a été lancée
+        if self.can_throw:
+            if self.fireballs.spawn(self.x + self.width if self.facing_right else self.x - 10,
+                                    self.y + self.height//2 - 5,
+                                    10 if self.facing_right else -10):
+                self.can_throw = False
+                return True
+        return False
+
+# Classe des plateformes
+class Platform:
+    def __init__(self, x, y, width, is_breakable=False):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = 20
+        self.depth = 15
+        self.is_breakable = is_breakable
+
+# Classe des pièces
+class Coin:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.size = 20
+        self.width = self.size   # Boîte englobante (pour l'index spatial)
+        self.height = self.size
+        self.animation_frame = 0
+        self.animation_speed = 0.15
+
+    def animate(self):
+        # Animation de la pièce (effet de brillance)
+        self.animation_frame += self.animation_speed
+
+# Classe des portes
+class Door:
+    def __init__(self, x, y, next_level, coins_required):
+        self.x = x
+        self.y = y
+        self.width = 40
+        self.height = 60
+        self.depth = 15
+        self.next_level = next_level
+        self.coins_required = coins_required
+        self.animation_frame = 0
+
+    def animate(self):
+        # Animation de la porte (effet de brillance)
+        self.animation_frame += 0.05
+
+# Niveau prêt à jouer, construit à partir de sa forme compilée (voir levels.py).
+# Les entités sont recréées à chaque chargement car la partie les modifie
+# (pièces ramassées, ennemis tués, plateformes cassées), mais sans relire ni analyser le
+# fichier. Tout ce qui ne dépend ni de l'aléatoire de la partie ni de la position du
+# joueur est construit ici : un niveau peut donc être préparé à l'avance, dans un autre
+# thread (voir prefetch.py), et ne servir qu'une fois.
+class PreparedLevel:
+    def __init__(self, level_num, cache=level_cache):
+        self.number = level_num
+        self.level = cache.get(level_num)
+        self.platforms = [Platform(x, y, width, bool(breakable))
+                          for x, y, width, breakable in self.level.platforms.tolist()]
+        self.coins = [Coin(x, y) for x, y in self.level.coins.tolist()]
+        self.doors = [Door(x, y, next_level, coins_required)
+                      for x, y, next_level, coins_required in self.level.doors.tolist()]
+        self.width = max(WIDTH, self.level.width)  # Largeur du monde, au moins celle de la fenêtre
+        # Index spatiaux pour limiter les tests de collision aux cellules voisines
+        self.platform_index = build_index(self.platforms)
+        self.coin_index = build_index(self.coins)
+        self.door_index = build_index(self.doors)
+        # Monde en chunks : seuls ceux proches de la caméra sont simulés et dessinés
+        self.world = World(self.platforms, self.coins, self.doors, self.width, Coin)
+
+    def enemies(self, rng=random):
+        # Type d'ennemi aléatoire quand le niveau ne le fixe pas : tiré au chargement
+        level = self.level
+        types = [ENEMY_TYPES.index(rng.choice(ENEMY_TYPES)) if code == RANDOM_TYPE else code
+                 for code in level.enemies[:, 4].tolist()]
+        return EnemyManager(level.enemies[:, 0], level.enemies[:, 1], level.enemy_speeds,
+                            level.enemies[:, 2], level.enemies[:, 3], types)
+
+# État complet d'une partie, avancé tick par tick avec step()
+class GameState:
+    def __init__(self, level=1, seed=None):
+        # Générateur aléatoire propre à la partie : avec la même graine et les mêmes
+        # entrées, deux parties sont identiques tick pour tick
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.profiler = NULL_PROFILER  # Mesure des phases du tick (voir profiler.py)
+        self.prefetcher = None         # Niveaux préparés à l'avance (voir prefetch.py)
+        self.high_score = 0   # Meilleur score de la session
+        self.tick = 0         # Nombre de ticks simulés
+        self.events = []      # Événements (sons) produits pendant le dernier tick
+        self.effects = []     # Effets visuels du dernier tick : (type, x, y), voir particles.py
+        self.reset(level)
+
+    def reset(self, level=1):
+        # Nouvelle partie : nouveau joueur et rechargement du niveau
+        self.player = Player()
+        self.status = "playing"  # "playing", "game_over" ou "victory"
+        self.load(level)
+
+    def load(self, level):
+        # Chargement d'un niveau sans toucher au joueur : niveau préparé à l'avance par
+        # self.prefetcher s'il est prêt, sinon construit tout de suite
+        prepared = self.prefetcher.take(level) if self.prefetcher is not None else None
+        if prepared is None:
+            prepared = PreparedLevel(level)
+        self.current_level = level
+        self.platforms = prepared.platforms
+        self.doors = prepared.doors
+        self.enemies = prepared.enemies(self.rng)
+        self.platform_index = prepared.platform_index
+        self.coin_index = prepared.coin_index
+        self.door_index = prepared.door_index
+        self.world = prepared.world
+        self.camera = Camera(prepared.width, WIDTH)
+        self.update_camera()
+
+    def update_camera(self):
+        # Suivi du joueur et activation des chunks autour de la caméra
+        self.camera.follow(self.player)
+        self.world.update(self.camera, self.enemies, self.coin_index)
+
+    def remove_coin(self, coin):
+        self.world.remove_coin(coin)
+        self.coin_index.remove(coin)
+
+    def break_platform(self, platform):
+        # Destruction d'une plateforme cassable : retrait de l'index de collision et du
+        # monde, sans reconstruire ni l'un ni l'autre
+        self.platform_index.remove(platform)
+        self.platforms.remove(platform)
+        self.world.remove_platform(platform)
+        self.effects.append(("debris", platform.x + platform.width / 2, platform.y + platform.height / 2))
+
+    def step(self, inputs=0):
+        # Avance la partie d'un tick avec le masque d'entrées donné.
+        # Renvoie la liste des événements produits (pour les sons).
+        self.events = []
+        self.effects = []
+        self.tick += 1
+
+        if self.status != "playing":
+            # Redémarrage après game over ou victoire
+            if inputs & INPUT_RESTART:
+                self.high_score = max(self.high_score, self.player.score)
+                self.reset()
+            return self.events
+
+        player = self.player
+        if inputs & INPUT_JUMP and player.jump():
+            self.events.append("jump")
+        if inputs & INPUT_FIRE and player.throw_fireball():
+            self.events.append("fireball")
+        if inputs & INPUT_RESET:
+            # Réinitialisation du jeu avec R
+            self.reset()
+            player = self.player
+
+        player.move(inputs)
+
+        # Mise à jour des ennemis
+        start = self.profiler.begin()
+        self.enemies.update()
+        self.profiler.end("update.enemies", start)
+
+        # Mise à jour du joueur et vérification des collisions
+        start = self.profiler.begin()
+        result = player.update(self)
+        self.profiler.end("update.player", start)
+        if result == "game_over":
+            self.status = "game_over"  # Passage en état game over
+        elif result != self.current_level:
+            if result == 4 and self.current_level == 3:
+                self.status = "victory"  # Victoire après le niveau 3
+            else:
+                # Passage au niveau suivant
+                self.load(result)
+                player.respawn()
+                player.is_jumping = False
+
+        # Suppression en bloc des ennemis tués pendant ce tick
+        self.enemies.compact()
+        self.update_camera()
+
+        # Animations des éléments du niveau (chunks actifs)
+        for coin in self.world.coins():
+            coin.animate()
+        for door in self.world.doors():
+            door.animate()
+
+        return self.events
@@ -0,0 +1,74 @@
+# Index spatial par grille uniforme (spatial hash) pour la détection de collisions.
+# Chaque entité (x, y, width, height) est inscrite dans les cellules qu'elle recouvre ;
+# une requête ne regarde que les cellules voisines au lieu de toute la liste.
+
+# Taille d'une cellule en pixels (un peu plus grande que le joueur)
+CELL_SIZE = 64
+
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}     # (cx, cy) -> {entité: None} (ensemble ordonné)
+        self.entries = {}   # entité -> [cellules couvertes, numéro d'inscription]
+        self.sequence = 0   # Compteur d'inscription, pour garder l'ordre des listes
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entity):
+        return entity in self.entries
+
+    def cell_range(self, x, y, width, height):
+        # Cellules couvertes par un rectangle, bords inclus
+        size = self.cell_size
+        return (int(x // size), int(y // size), int((x + width) // size), int((y + height) // size))
+
+    def add_to_cells(self, entity, span):
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    cell = self.cells[(cx, cy)] = {}
+                cell[entity] = None
+
+    def remove_from_cells(self, entity, span):
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells[(cx, cy)]
+                del cell[entity]
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def insert(self, entity):
+        span = self.cell_range(entity.x, entity.y, entity.width, entity.height)
+        self.entries[entity] = [span, self.sequence]
+        self.sequence += 1
+        self.add_to_cells(entity, span)
+
+    def remove(self, entity):
+        span, _ = self.entries.pop(entity)
+        self.remove_from_cells(entity, span)
+
+    def query(self, x, y, width, height):
+        # Entités dont les cellules touchent le rectangle, dans l'ordre d'inscription.
+        # C'est une présélection : le test de collision exact reste à faire.
+        x0, y0, x1, y1 = self.cell_range(x, y, width, height)
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        if len(found) > 1:
+            entries = self.entries
+            return sorted(found, key=lambda entity: entries[entity][1])
+        return list(found)
+
+# Construction d'un index à partir d'une liste d'entités
+def build_index(entities, cell_size=CELL_SIZE):
+    index = SpatialHash(cell_size)
+    for entity in entities:
+        index.insert(entity)
+    return index
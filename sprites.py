@@ -0,0 +1,222 @@
+# Cache de sprites pré-rendus pour le joueur, les ennemis, les pièces et les portes.
+# Chaque état visuel est dessiné une seule fois dans une Surface, puis réutilisé :
+# dessiner une entité ne coûte plus qu'un blit.
+import math
+
+import pygame
+
+from colors import (WHITE, BLACK, RED, DARK_RED, YELLOW, GOLD, GREEN, DARK_GREEN, BROWN,
+                    DARK_BROWN, MARIO_BLUE, ORANGE)
+from enemies import ENEMY_WIDTH, ENEMY_HEIGHT, ENEMY_DEPTH
+from particles import FADE_STEPS, PARTICLE_KINDS, PARTICLE_TYPES
+
+# Nombre de phases d'animation conservées par tour complet (2π)
+PLAYER_PHASES = 16
+ENEMY_PHASES = 16
+
+# Marge autour de l'entité pour contenir l'ombre, le chapeau, les bras et l'effet 3D
+PAD = 16
+
+# Couleur transparente des sprites opaques (particules, plateformes)
+COLORKEY = (255, 0, 255)
+
+# Création d'une surface transparente, convertie au format de l'écran si possible
+def new_sprite_surface(width, height):
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+# Création d'une surface opaque dont la couleur COLORKEY est transparente (RLE) : pour
+# les sprites sans demi-transparence, elle se blitte bien plus vite qu'une surface à
+# canal alpha
+def new_keyed_surface(width, height):
+    surface = pygame.Surface((width, height))
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    surface.fill(COLORKEY)
+    surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return surface
+
+# Indice de phase quantifié pour une frame d'animation continue
+def phase_index(animation_frame, phases):
+    return int(round(animation_frame / (2 * math.pi) * phases)) % phases
+
+# Dessin de Mario à la position (x, y) de la surface
+def bake_player(surface, x, y, width, height, depth, facing_right, leg_offset, arm_offset):
+    # Ombre du joueur (noire, comme sur l'écran sans canal alpha)
+    shadow = [(x + depth/2, y + height),
+              (x + width - depth/2, y + height),
+              (x + width + depth/2, y + height - depth),
+              (x + depth/2, y + height - depth)]
+    pygame.draw.polygon(surface, BLACK, shadow)
+
+    # Corps du joueur
+    pygame.draw.rect(surface, RED, (x, y, width, height), border_radius=5)
+    # Côté du corps pour l'effet 3D
+    side = [(x + width, y),
+            (x + width + depth, y - depth/2),
+            (x + width + depth, y + height - depth/2),
+            (x + width, y + height)]
+    pygame.draw.polygon(surface, DARK_RED, side)
+
+    # Chapeau de Mario
+    pygame.draw.rect(surface, RED, (x - 5, y - 5, width + 10, 15), border_radius=3)
+    hat_side = [(x + width + 5, y - 5),
+                (x + width + depth + 5, y - depth/2 - 5),
+                (x + width + depth + 5, y + 10 - depth/2),
+                (x + width + 5, y + 10)]
+    pygame.draw.polygon(surface, DARK_RED, hat_side)
+    pygame.draw.circle(surface, WHITE, (x + (15 if facing_right else 25), y + 5), 4)
+
+    # Jambes de Mario
+    leg1_y = y + 40 + (4 if leg_offset > 0 else 0)
+    leg2_y = y + 40 - (4 if leg_offset < 0 else 0)
+    pygame.draw.rect(surface, MARIO_BLUE, (x + 5, leg1_y, 12, 20 + abs(leg_offset)), border_radius=3)
+    pygame.draw.rect(surface, MARIO_BLUE, (x + 23, leg2_y, 12, 20 - abs(leg_offset)), border_radius=3)
+
+    # Bras de Mario
+    arm_y = y + 20 + (4 if arm_offset > 0 else 0)
+    arm_x = x - 5 if facing_right else x + 40
+    pygame.draw.rect(surface, RED, (arm_x, arm_y, 10, 20 + abs(arm_offset)), border_radius=3)
+    pygame.draw.rect(surface, WHITE, (arm_x + (2 if facing_right else 0), arm_y + 15, 6, 6), border_radius=3)
+
+    # Visage de Mario
+    eye_x = x + (25 if facing_right else 15)
+    pygame.draw.circle(surface, WHITE, (eye_x, y + 15), 6)
+    pygame.draw.circle(surface, BLACK, (eye_x, y + 15), 3)
+
+# Dessin d'un ennemi à la position (x, y) de la surface
+def bake_enemy(surface, x, y, width, height, depth, enemy_type, animation_frame):
+    color = ORANGE if enemy_type == "goomba" else GREEN
+    dark_color = (200, 100, 0) if enemy_type == "goomba" else DARK_GREEN
+    wobble = math.sin(animation_frame) * 2
+    pygame.draw.rect(surface, color, (x, y + wobble, width, height - wobble), border_radius=5)
+    side = [(x + width, y + wobble),
+            (x + width + depth, y + wobble - depth),
+            (x + width + depth, y + height - wobble - depth),
+            (x + width, y + height - wobble)]
+    pygame.draw.polygon(surface, dark_color, side)
+    eye_offset = math.cos(animation_frame) * 2
+    eye_x1 = x + 8
+    eye_x2 = x + 22
+    pygame.draw.circle(surface, WHITE, (eye_x1, y + 10 + wobble + eye_offset), 4)
+    pygame.draw.circle(surface, WHITE, (eye_x2, y + 10 + wobble - eye_offset), 4)
+    pygame.draw.circle(surface, BLACK, (eye_x1, y + 10 + wobble + eye_offset), 2)
+    pygame.draw.circle(surface, BLACK, (eye_x2, y + 10 + wobble - eye_offset), 2)
+
+# Dessin d'une pièce de rayon donné, centrée en (cx, cy)
+def bake_coin(surface, cx, cy, radius):
+    pygame.draw.circle(surface, YELLOW, (cx, cy), radius)
+    pygame.draw.circle(surface, GOLD, (cx + 2, cy - 2), radius - 2)
+    pygame.draw.circle(surface, BLACK, (cx, cy), radius, 1)
+    pygame.draw.circle(surface, WHITE, (cx + 3, cy - 3), 4)
+
+# Dessin d'une porte à la position (x, y) de la surface
+def bake_door(surface, x, y, width, height, depth, text):
+    pygame.draw.rect(surface, BROWN, (x, y, width, height), border_radius=5)
+    side = [(x + width, y),
+            (x + width + depth, y - depth),
+            (x + width + depth, y + height - depth),
+            (x + width, y + height)]
+    pygame.draw.polygon(surface, DARK_BROWN, side)
+    pygame.draw.rect(surface, BLACK, (x, y, width, height), 2, border_radius=5)
+    pygame.draw.circle(surface, YELLOW, (x + 30, y + height//2), 6)
+    surface.blit(text, (x + width//2 - text.get_width()//2, y + height//2 - text.get_height()//2))
+
+# Dessin d'une boule de feu centrée en (cx, cy)
+def bake_fireball(surface, cx, cy):
+    pygame.draw.circle(surface, ORANGE, (cx, cy), 8)
+    pygame.draw.circle(surface, YELLOW, (cx + 2, cy - 2), 5)
+
+def bake_particle(surface, cx, cy, radius, color):
+    pygame.draw.circle(surface, color, (cx, cy), radius)
+
+# Cache des sprites : chaque clé d'état visuel est dessinée à la première demande.
+# Chaque méthode renvoie la surface et le décalage à appliquer à la position de l'entité.
+class SpriteCache:
+    def __init__(self, font, text_cache):
+        self.font = font              # Police du nombre de pièces requis sur les portes
+        self.text_cache = text_cache  # Cache des textes partagé
+        self.sprites = {}   # Clé d'état visuel -> Surface
+
+    def clear(self):
+        self.sprites.clear()
+
+    def player(self, player):
+        phase = phase_index(player.animation_frame, PLAYER_PHASES)
+        key = ("player", player.facing_right, player.moving, phase)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            angle = phase * 2 * math.pi / PLAYER_PHASES
+            leg_offset = math.sin(angle) * 8 if player.moving else 0
+            arm_offset = math.cos(angle) * 8
+            sprite = new_sprite_surface(player.width + player.depth + 2 * PAD, player.height + 2 * PAD)
+            bake_player(sprite, PAD, PAD, player.width, player.height, player.depth,
+                        player.facing_right, leg_offset, arm_offset)
+            self.sprites[key] = sprite
+        return sprite, -PAD, -PAD
+
+    def enemy(self, enemy_type, animation_frame):
+        phase = phase_index(animation_frame, ENEMY_PHASES)
+        key = ("enemy", enemy_type, phase)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = new_sprite_surface(ENEMY_WIDTH + ENEMY_DEPTH + 2 * PAD, ENEMY_HEIGHT + 2 * PAD)
+            bake_enemy(sprite, PAD, PAD, ENEMY_WIDTH, ENEMY_HEIGHT, ENEMY_DEPTH,
+                       enemy_type, phase * 2 * math.pi / ENEMY_PHASES)
+            self.sprites[key] = sprite
+        return sprite, -PAD, -PAD
+
+    def coin(self, coin):
+        # Le rayon entier suffit à décrire l'état de la pulsation
+        scale = 0.8 + 0.2 * math.sin(coin.animation_frame)
+        radius = int(coin.size * scale / 2)
+        key = ("coin", coin.size, radius)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = new_sprite_surface(coin.size + 2 * PAD, coin.size + 2 * PAD)
+            center = PAD + coin.size // 2
+            bake_coin(sprite, center, center, radius)
+            self.sprites[key] = sprite
+        return sprite, -PAD, -PAD
+
+    def door(self, door):
+        # La lueur n'influe que sur la couleur du texte, arrondie à l'entier
+        glow = math.sin(door.animation_frame) * 10
+        level = -1 if glow < 0 else int(glow)
+        key = ("door", door.coins_required, level)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            text_color = WHITE if level < 0 else (255, min(255, 215 + level), 0)
+            text = self.text_cache.render(self.font, str(door.coins_required), text_color)
+            sprite = new_sprite_surface(door.width + door.depth + 2 * PAD, door.height + 2 * PAD)
+            bake_door(sprite, PAD, PAD, door.width, door.height, door.depth, text)
+            self.sprites[key] = sprite
+        return sprite, -PAD, -PAD
+
+    def fireball(self):
+        sprite = self.sprites.get("fireball")
+        if sprite is None:
+            sprite = new_sprite_surface(2 * PAD, 2 * PAD)
+            bake_fireball(sprite, PAD, PAD)
+            self.sprites["fireball"] = sprite
+        return sprite, -PAD, -PAD
+
+    def particles(self):
+        # Sprites de toutes les particules, indexés comme ParticleSystem.sprites() : un
+        # par type et par niveau de fondu. Les particules s'effacent en rétrécissant : des
+        # sprites opaques à couleur transparente (RLE) se blittent bien plus vite que des
+        # sprites à canal alpha, ce qui compte avec des milliers de particules.
+        sprites = self.sprites.get("particles")
+        if sprites is None:
+            sprites = []
+            for kind in PARTICLE_KINDS:
+                radius = PARTICLE_TYPES[kind]["radius"]
+                for step in range(FADE_STEPS):
+                    sprite = new_keyed_surface(2 * radius + 1, 2 * radius + 1)
+                    size = max(1, radius * (FADE_STEPS - step) // FADE_STEPS)
+                    bake_particle(sprite, radius, radius, size, PARTICLE_TYPES[kind]["color"])
+                    sprites.append((sprite, -radius, -radius))
+            self.sprites["particles"] = sprites
+        return sprites
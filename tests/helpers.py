@@ -0,0 +1,17 @@
+# Outils partagés par les tests
+from rewind import encode_motion, encode_structure
+from runner import random_policy
+from simulation import GameState
+
+# Empreinte complète d'un état : structure du niveau et mouvement (voir rewind.py)
+def fingerprint(state):
+    return encode_structure(state).tobytes() + encode_motion(state).tobytes()
+
+# Partie aux entrées pseudo-aléatoires : (état, entrées jouées)
+def play(level=1, seed=0, ticks=600):
+    state = GameState(level, seed)
+    policy = random_policy(seed)
+    inputs = [policy(tick) for tick in range(ticks)]
+    for value in inputs:
+        state.step(value)
+    return state, inputs
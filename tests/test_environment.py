@@ -0,0 +1,29 @@
+import numpy as np
+
+from environment import MarioEnv, VectorMarioEnv
+from runner import random_policy
+
+
+def test_vector_env_matches_single_env():
+    # Mêmes entrées pour chaque partie des deux environnements, jusqu'à la fin du premier
+    # épisode (VectorMarioEnv relance aussitôt une partie terminée : seules la récompense
+    # et la fin sont comparées sur ce tick)
+    count, ticks = 16, 1200
+    policies = [random_policy(seed) for seed in range(count)]
+    vector = VectorMarioEnv(count)
+    vector.reset()
+    singles = [MarioEnv() for _ in range(count)]
+    for env in singles:
+        env.reset(seed=0)
+    running = list(range(count))
+    for tick in range(ticks):
+        actions = np.array([policy(tick) for policy in policies])
+        observations, rewards, terminated, _, _ = vector.step(actions)
+        for i in list(running):
+            observation, reward, ended, truncated, _ = singles[i].step(actions[i])
+            assert reward == rewards[i]
+            assert ended == terminated[i]
+            if ended or truncated:
+                running.remove(i)
+            else:
+                assert np.array_equal(observation, observations[i]), (i, tick)
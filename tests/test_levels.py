@@ -0,0 +1,42 @@
+import json
+import os
+
+import numpy as np
+
+from levels import CompiledLevel, LevelCache, compile_level, level_paths, read_level
+
+DESCRIPTION = {
+    "number": 7,
+    "platforms": [{"x": 0, "y": 560, "width": 800}, {"x": 100, "y": 400, "width": 120, "breakable": True}],
+    "coins": [{"x": 150, "y": 360}],
+    "doors": [{"x": 700, "y": 500, "next_level": 8, "coins_required": 1}],
+    "enemies": [{"x": 300, "y": 530, "min_x": 250, "max_x": 450, "type": "goomba"},
+                {"x": 500, "y": 530, "min_x": 450, "max_x": 650, "speed": 2.5}],
+}
+
+
+def assert_same_level(a, b):
+    assert a.number == b.number
+    for name in ("platforms", "coins", "doors", "enemies", "enemy_speeds"):
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+
+
+def test_bytes_round_trip():
+    level = compile_level(DESCRIPTION)
+    assert_same_level(CompiledLevel.from_bytes(level.to_bytes()), level)
+
+
+def test_read_level_compiles_then_reads_compiled_file(tmp_path):
+    json_path, compiled_path = level_paths(7, str(tmp_path))
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(DESCRIPTION, f)
+    first = read_level(7, str(tmp_path))
+    assert os.path.exists(compiled_path)
+    os.remove(json_path)  # Seul le fichier compilé reste
+    assert_same_level(read_level(7, str(tmp_path)), first)
+    assert_same_level(first, compile_level(DESCRIPTION))
+
+
+def test_unknown_level_is_empty(tmp_path):
+    level = LevelCache(str(tmp_path)).get(42)
+    assert len(level.platforms) == len(level.coins) == len(level.doors) == len(level.enemies) == 0
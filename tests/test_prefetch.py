@@ -0,0 +1,34 @@
+from helpers import fingerprint
+from prefetch import LevelPrefetcher
+from runner import random_policy
+from simulation import GameState
+
+
+def cross_doors(prefetcher, seed=5, ticks=900):
+    # Partie où Mario est posé devant puis sur la porte toutes les 150 ticks
+    state = GameState(1, seed)
+    state.prefetcher = prefetcher
+    policy = random_policy(seed)
+    prints = []
+    for tick in range(ticks):
+        door = state.doors[0] if state.doors else None
+        if door is not None and tick % 150 == 75:
+            state.player.x = door.x - 200
+        elif door is not None and tick % 150 == 149:
+            state.player.coins_collected = max(state.player.coins_collected, door.coins_required)
+            state.player.x, state.player.y = door.x, door.y
+        state.step(policy(tick))
+        if prefetcher is not None:
+            prefetcher.update(state)
+        if state.status != "playing":
+            state.reset(1)
+        prints.append(fingerprint(state))
+    return state, prints
+
+
+def test_prefetched_levels_play_identically():
+    prefetcher = LevelPrefetcher()
+    _, expected = cross_doors(None)
+    state, prints = cross_doors(prefetcher)
+    assert prints == expected
+    assert prefetcher.hits > 0
@@ -0,0 +1,15 @@
+from enemies import EnemyManager
+from projectiles import ProjectilePool
+
+
+def test_interpolation_starts_at_spawn_point():
+    pool = ProjectilePool()
+    pool.spawn(100.0, 50.0, 10.0)
+    # Lancée pendant le tick : jamais dessinée derrière son point de départ
+    assert list(pool.positions(0.0)) == [(100.0, 50.0)]
+    pool.update(EnemyManager(), 0, 1000)
+    pool.spawn(300.0, 50.0, -10.0)
+    assert list(pool.positions(0.5)) == [(105.0, 50.0), (300.0, 50.0)]
+    # La suppression déplace aussi la position précédente
+    pool.remove(0)
+    assert list(pool.positions(0.0)) == [(300.0, 50.0)]
@@ -0,0 +1,46 @@
+import zlib
+
+import pytest
+
+from helpers import fingerprint, play
+from replay import InputRecorder, Replay, game_result
+from simulation import GameState
+from timestep import FixedTimestep
+
+
+def test_same_seed_same_game():
+    first, _ = play(seed=3)
+    second, _ = play(seed=3)
+    assert fingerprint(first) == fingerprint(second)
+
+
+def test_replay_round_trip():
+    state, inputs = play(seed=7, ticks=900)
+    recorder = InputRecorder(7)
+    for value in inputs:
+        recorder.record(value)
+    replay = Replay.from_bytes(recorder.to_bytes(state))
+    assert replay.inputs == bytes(inputs)
+    same, result = replay.verify()
+    assert same
+    assert result == game_result(state)
+
+
+def test_replay_rejects_bad_data():
+    recorder = InputRecorder(1)
+    for _ in range(100):
+        recorder.record(0)
+    data = recorder.to_bytes(GameState(1, 1))
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(zlib.error):
+        Replay.from_bytes(data[:-4])
+
+
+def test_fixed_timestep_catch_up():
+    timestep = FixedTimestep(tick_rate=60, max_steps=5)
+    assert timestep.advance(1 / 120) == 0
+    assert timestep.advance(1 / 120) == 1
+    assert timestep.advance(0.2) == 5
+    assert timestep.dropped == 7
+    assert 0.0 <= timestep.alpha <= 1.0
@@ -0,0 +1,64 @@
+from helpers import fingerprint
+from rewind import RewindBuffer
+from runner import random_policy
+from simulation import GameState
+
+
+def record(buffer, seed=0, ticks=900, level=1):
+    # Partie capturée tick par tick : empreinte de chaque tick
+    state = GameState(level, seed)
+    buffer.capture(state)
+    prints = {state.tick: fingerprint(state)}
+    policy = random_policy(seed)
+    for tick in range(ticks):
+        state.step(policy(tick))
+        buffer.capture(state)
+        prints[state.tick] = fingerprint(state)
+    return state, prints, policy
+
+
+def test_restore_matches_capture():
+    buffer = RewindBuffer(keyframe_interval=50)
+    state, prints, _ = record(buffer)
+    for tick in (899, 700, 451, 450, 200, 37):
+        assert buffer.restore(state, tick)
+        assert fingerprint(state) == prints[tick]
+
+
+def test_replay_after_rewind_is_identical():
+    buffer = RewindBuffer(keyframe_interval=50)
+    state, prints, _ = record(buffer, seed=4)
+    assert buffer.restore(state, 300)
+    # Mêmes entrées qu'à la première partie à partir du tick 300
+    policy = random_policy(4)
+    for tick in range(300):
+        policy(tick)
+    for tick in range(300, 900):
+        state.step(policy(tick))
+        buffer.capture(state)
+        assert fingerprint(state) == prints[state.tick]
+
+
+def test_bounded_memory_keeps_recent_history():
+    buffer = RewindBuffer(memory=64 * 1024, keyframe_interval=30)
+    state, prints, _ = record(buffer, seed=2, ticks=3000)
+    assert buffer.used * 8 <= 64 * 1024
+    assert 0 < len(buffer) < 3001
+    assert buffer.last_tick == state.tick
+    tick = buffer.first_tick + 1
+    assert buffer.restore(state, tick)
+    assert fingerprint(state) == prints[tick]
+    assert not buffer.restore(state, buffer.first_tick - 1)
+
+
+def test_retry_restores_level_start():
+    buffer = RewindBuffer()
+    state = GameState(1, 9)
+    buffer.capture(state)
+    start = fingerprint(state)
+    policy = random_policy(9)
+    for tick in range(400):
+        state.step(policy(tick))
+        buffer.capture(state)
+    assert buffer.retry(state)
+    assert fingerprint(state) == start
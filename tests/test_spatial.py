@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+
+from enemies import EnemyManager
+from spatial import SpatialHash
+
+
+class Box:
+    def __init__(self, x, y, width, height):
+        self.x, self.y, self.width, self.height = x, y, width, height
+
+
+def touching(boxes, x, y, width, height):
+    return [box for box in boxes
+            if box.x < x + width and x < box.x + box.width and box.y < y + height and y < box.y + box.height]
+
+
+def test_query_finds_every_overlap_in_insertion_order():
+    rng = random.Random(0)
+    boxes = [Box(rng.randint(0, 2000), rng.randint(0, 600), rng.randint(5, 200), rng.randint(5, 60))
+             for _ in range(300)]
+    index = SpatialHash()
+    for box in boxes:
+        index.insert(box)
+    for box in boxes[::3]:
+        index.remove(box)
+    kept = [box for i, box in enumerate(boxes) if i % 3]
+    assert len(index) == len(kept)
+    for _ in range(200):
+        x, y = rng.randint(-50, 2000), rng.randint(-50, 600)
+        found = index.query(x, y, 40, 60)
+        expected = touching(kept, x, y, 40, 60)
+        assert set(expected) <= set(found)
+        assert [box for box in found if box in expected] == expected
+
+
+def test_enemy_grid_matches_full_scan():
+    rng = np.random.default_rng(1)
+    n = 500
+    x = rng.uniform(0, 5000, n)
+    enemies = EnemyManager(x, rng.uniform(0, 600, n), rng.uniform(1, 3, n), x - 20, x + 60, np.zeros(n))
+    for tick in range(120):
+        enemies.update()
+        for i in rng.integers(0, len(enemies), 2).tolist():
+            enemies.kill(i)
+        for _ in range(50):
+            qx, qy = rng.uniform(-100, 5100), rng.uniform(-50, 650)
+            size = rng.choice((10, 40, 1500))
+            full = np.flatnonzero((qx + size > enemies.x) & (qx < enemies.x + enemies.width) &
+                                  (qy + size > enemies.y) & (qy < enemies.y + enemies.height) &
+                                  enemies.alive).tolist()
+            assert enemies.overlapping(qx, qy, size, size) == full
+        enemies.compact()
@@ -0,0 +1,28 @@
+# Cache des textes rendus par les polices (HUD, menu, portes, écrans de fin).
+# Un texte n'est rendu qu'une fois pour une police, une chaîne et une couleur données ;
+# les entrées les moins récemment utilisées sont évincées au-delà de la capacité.
+from collections import OrderedDict
+
+class TextCache:
+    def __init__(self, capacity=256):
+        self.capacity = capacity      # Nombre maximal de surfaces conservées
+        self.surfaces = OrderedDict() # (police, texte, couleur) -> Surface
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)  # Éviction du moins récemment utilisé
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
@@ -0,0 +1,49 @@
+# Pas de temps fixe pour la simulation, découplé de la cadence d'affichage.
+# La logique avance toujours par ticks de 1/TICK_RATE s : une frame lente déclenche
+# plusieurs ticks de rattrapage (dans la limite de MAX_CATCH_UP), et le rendu
+# interpole les positions entre les deux derniers états simulés.
+
+# Cadence de la simulation (les constantes physiques sont réglées pour 60 ticks/s)
+TICK_RATE = 60
+# Nombre maximal de ticks simulés pour une seule frame
+MAX_CATCH_UP = 5
+# Durée de frame maximale prise en compte (pause, déplacement de la fenêtre...)
+MAX_FRAME_TIME = 0.25
+
+# Accumulateur de temps réel converti en ticks de simulation
+class FixedTimestep:
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_CATCH_UP):
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0  # Ticks abandonnés faute de temps (le jeu ralentit)
+
+    def advance(self, frame_time):
+        # Renvoie le nombre de ticks à simuler pour `frame_time` secondes écoulées
+        self.accumulator += min(frame_time, MAX_FRAME_TIME)
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # Au-delà du plafond, le retard est abandonné plutôt que rattrapé
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        # Fraction du tick suivant déjà écoulée, pour l'interpolation du rendu
+        return min(1.0, self.accumulator / self.dt)
+
+# Positions avant le dernier tick, pour interpoler le rendu
+class PositionSnapshot:
+    __slots__ = ("level", "player_x", "player_y", "camera_x", "enemy_x", "enemy_generation")
+
+    def __init__(self, state):
+        self.level = state.current_level
+        self.player_x = state.player.x
+        self.player_y = state.player.y
+        self.camera_x = state.camera.x
+        self.enemy_x = state.enemies.x.copy()
+        self.enemy_generation = state.enemies.generation
@@ -0,0 +1,147 @@
+# Monde découpé en tranches verticales (chunks) de CHUNK_WIDTH pixels et caméra qui
+# suit le joueur. Seuls les chunks proches de la caméra sont actifs : leurs ennemis
+# sont simulés, leurs pièces et portes animées et dessinées. Les autres sont suspendus
+# (ennemis gelés hors du moteur NumPy) et, loin de la caméra, leurs pièces sont libérées
+# et gardées sous forme de simples coordonnées jusqu'au retour du joueur.
+# Un niveau qui tient dans l'écran n'a que des chunks actifs : rien ne change pour lui.
+import numpy as np
+
+# Largeur d'un chunk en pixels
+CHUNK_WIDTH = 400
+# Chunks actifs de part et d'autre de la zone visible
+ACTIVE_MARGIN = 1
+# Distance (en chunks) au-delà de laquelle les pièces d'un chunk suspendu sont libérées
+RELEASE_MARGIN = 4
+
+# Boîte englobante du dessin d'une plateforme, relief et traits compris :
+# (x, y, largeur, hauteur)
+def platform_bounds(platform):
+    return (platform.x - 2, platform.y - platform.depth - 2,
+            platform.width + platform.depth + 4, platform.height + platform.depth + 4)
+
+# Caméra horizontale centrée sur le joueur, bornée aux limites du monde
+class Camera:
+    def __init__(self, world_width, view_width):
+        self.view_width = view_width
+        self.max_x = max(0, world_width - view_width)
+        self.x = 0
+
+    def follow(self, player):
+        target = player.x + player.width / 2 - self.view_width / 2
+        self.x = min(max(target, 0), self.max_x)
+
+class Chunk:
+    def __init__(self, index, x, width):
+        self.index = index
+        self.x = x
+        self.width = width
+        self.platforms = []   # Plateformes qui recouvrent le chunk (dessin)
+        self.coins = []       # Pièces dont le coin gauche est dans le chunk
+        self.doors = []
+        self.enemies = None   # Ennemis suspendus (voir EnemyManager.extract)
+        self.released = None  # Positions (n, 2) des pièces libérées, ou None
+        self.damaged = []     # Zones des plateformes détruites (liste qui ne fait que croître)
+        self.active = False
+
+class World:
+    def __init__(self, platforms, coins, doors, width, make_coin, chunk_width=CHUNK_WIDTH):
+        self.width = width
+        self.make_coin = make_coin  # Recréation d'une pièce libérée : make_coin(x, y)
+        self.chunk_width = chunk_width
+        count = max(1, -(-width // chunk_width))
+        self.chunks = [Chunk(i, i * chunk_width, chunk_width) for i in range(count)]
+        for platform in platforms:
+            # Une plateforme (et son relief) peut déborder sur plusieurs chunks
+            first = self.chunk_index(platform.x)
+            last = self.chunk_index(platform.x + platform.width + platform.depth)
+            for chunk in self.chunks[first:last + 1]:
+                chunk.platforms.append(platform)
+        for coin in coins:
+            self.chunk_at(coin.x).coins.append(coin)
+        for door in doors:
+            self.chunk_at(door.x).doors.append(door)
+        # Au chargement tout est actif ; le premier update() suspend les chunks lointains
+        self.active = list(self.chunks)  # Chunks actifs, de gauche à droite
+        for chunk in self.chunks:
+            chunk.active = True
+        self.generation = 0    # Incrémenté à chaque changement des chunks actifs
+
+    def chunk_index(self, x):
+        return min(max(int(x // self.chunk_width), 0), len(self.chunks) - 1)
+
+    def chunk_at(self, x):
+        return self.chunks[self.chunk_index(x)]
+
+    def visible(self, camera):
+        # Chunks qui touchent l'écran
+        first = self.chunk_index(camera.x)
+        last = self.chunk_index(camera.x + camera.view_width - 1)
+        return self.chunks[first:last + 1]
+
+    def coins(self):
+        # Pièces des chunks actifs
+        for chunk in self.active:
+            yield from chunk.coins
+
+    def doors(self):
+        for chunk in self.active:
+            yield from chunk.doors
+
+    def update(self, camera, enemies, coin_index):
+        # Active les chunks proches de la caméra et suspend les autres.
+        # Renvoie True si l'ensemble des chunks actifs a changé.
+        first = max(self.chunk_index(camera.x) - ACTIVE_MARGIN, 0)
+        last = self.chunk_index(camera.x + camera.view_width - 1) + ACTIVE_MARGIN
+        active = self.chunks[first:last + 1]
+        if active == self.active:
+            return False
+        for chunk in self.active:
+            if chunk.index < first or chunk.index > last:
+                self.suspend(chunk, enemies)
+        for chunk in active:
+            if not chunk.active:
+                self.activate(chunk, enemies, coin_index)
+        self.active = active
+        # Libération des pièces des chunks suspendus lointains
+        for chunk in self.chunks:
+            if (not chunk.active and chunk.coins and
+                    (chunk.index < first - RELEASE_MARGIN or chunk.index > last + RELEASE_MARGIN)):
+                self.release(chunk, coin_index)
+        self.generation += 1
+        return True
+
+    def suspend(self, chunk, enemies):
+        # Les ennemis qui se trouvent dans le chunk sortent du moteur, figés en place
+        indices = np.minimum(np.maximum(enemies.x // self.chunk_width, 0), len(self.chunks) - 1)
+        chunk.enemies = enemies.extract(indices == chunk.index)
+        chunk.active = False
+
+    def activate(self, chunk, enemies, coin_index):
+        if chunk.enemies is not None:
+            enemies.extend(chunk.enemies)
+            chunk.enemies = None
+        if chunk.released is not None:
+            chunk.coins = [self.make_coin(x, y) for x, y in chunk.released.tolist()]
+            for coin in chunk.coins:
+                coin_index.insert(coin)
+            chunk.released = None
+        chunk.active = True
+
+    def release(self, chunk, coin_index):
+        chunk.released = np.array([(coin.x, coin.y) for coin in chunk.coins], np.int32).reshape(-1, 2)
+        for coin in chunk.coins:
+            coin_index.remove(coin)
+        chunk.coins = []
+
+    def remove_coin(self, coin):
+        self.chunk_at(coin.x).coins.remove(coin)
+
+    def remove_platform(self, platform):
+        # Retrait d'une plateforme détruite. La zone qu'elle occupait est notée dans chaque
+        # chunk touché : seul ce morceau du calque sera redessiné (voir LevelLayer).
+        bounds = platform_bounds(platform)
+        first = self.chunk_index(platform.x)
+        last = self.chunk_index(platform.x + platform.width + platform.depth)
+        for chunk in self.chunks[first:last + 1]:
+            chunk.platforms.remove(platform)
+            chunk.damaged.append(bounds)